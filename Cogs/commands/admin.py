@@ -3,8 +3,8 @@ from discord.ext import commands
 
 from Cogs.exceptions import CmdError
 from Utils.generics.embeds import SuccessEmbed
-from database import get_mongodb_client
-from database.models import WhiskeyDatabase
+from database import get_async_mongodb_client
+from database.models import AsyncWhiskeyDatabase
 
 
 class Setters(commands.Cog):
@@ -31,8 +31,9 @@ class Setters(commands.Cog):
         if prefix is None:
             raise CmdError(f'`{ctx.prefix}set prefix [prefix]`')
 
-        discord_guild = WhiskeyDatabase(get_mongodb_client()).discord_guilds
-        discord_guild.update_one({'_id': ctx.guild.id}, {'$set': {'prefix': prefix}})
+        discord_guild = AsyncWhiskeyDatabase(get_async_mongodb_client()).discord_guilds
+        await discord_guild.update_one({'_id': ctx.guild.id}, {'$set': {'prefix': prefix}})
+        self.bot.prefix_cache.set(ctx.guild.id, prefix)
         await ctx.send(embed=SuccessEmbed.get(f'Set prefix to: `{prefix}`'))
 
 
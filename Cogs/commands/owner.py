@@ -7,9 +7,9 @@ from Cogs.exceptions import CmdError
 from Utils.dataclasses.paginator import PageType, InformationPage
 from Utils.generics.discord import SuccessEmbed
 from Utils.generics.strings import is_valid_enum_value, convert_json_string_to_dict
-from database import get_mongodb_client, mongo_collection
+from database import get_async_mongodb_client, motor_collection
 from database.codec import DiscordEmbedCodec
-from database.models import WhiskeyDatabase
+from database.models import AsyncWhiskeyDatabase
 
 
 class PageBuilder:
@@ -17,15 +17,15 @@ class PageBuilder:
     def __init__(self, data: InformationPage):
         self.data = data
 
-    def push_to_database(self, collection: mongo_collection) -> None:
-        collection.insert_one(self.data.dict(by_alias=True))
+    async def push_to_database(self, collection: motor_collection) -> None:
+        await collection.insert_one(self.data.dict(by_alias=True))
 
-    def remove_from_database(self, collection: mongo_collection) -> None:
-        collection.delete_one({'_id': self.data.id})
+    async def remove_from_database(self, collection: motor_collection) -> None:
+        await collection.delete_one({'_id': self.data.id})
 
 
-def get_pages_collection(page_type: str) -> mongo_collection:
-    return WhiskeyDatabase(get_mongodb_client()).pages.get_collection(
+def get_pages_collection(page_type: str) -> motor_collection:
+    return AsyncWhiskeyDatabase(get_async_mongodb_client()).pages.get_collection(
         f'pages.{page_type}', codec_options=CodecOptions(type_registry=TypeRegistry([DiscordEmbedCodec()]))
     )
 
@@ -47,7 +47,7 @@ class OwnerCommands(commands.Cog):
             raise CmdError(f'{page_type} is not a valid page type')
 
         embed = discord.Embed.from_dict(convert_json_string_to_dict(embed_json))
-        PageBuilder(
+        await PageBuilder(
             InformationPage(
                 parent=ObjectId(parent_id),
                 embed=embed
@@ -1,3 +1,4 @@
+import asyncio
 import textwrap
 from abc import ABC, abstractmethod
 from typing import TypeVar, Optional, Generator
@@ -13,16 +14,17 @@ from Utils.constants import images
 from Utils.dataclasses.abc import get_item_type
 from Utils.dataclasses.item import ItemComposite, ItemLeaf, return_default_image
 from Utils.generics import split_by_max_character_limit, arrays
-from Utils.generics.discord import to_message_data, send_with_paginator, get_image_from_link, \
-    get_most_prominent_color_from_image, rgb_tuple_to_discord_colour
+from Utils.discord.colours import colour_table
+from Utils.generics.discord import to_message_data, send_with_paginator
 from Utils.paginator.buttons import GoLeft, GoRight, GoFirst, GoLast, BetterSelectContainer, SelectContainerData, GoBack
 from Utils.paginator.page import PageDataNode, PageDataNodePromise, PageDataTree, MessageContentDisplay, \
     ButtonItemsDisplay, \
     TreeInformation, DisplayData, PageTreeController, PaginatorView
-from database import get_mongodb_client
-from database.command.read import TextSearch
+from database import get_mongodb_client, get_async_mongodb_client
+from database.command.read import LeafLoader
 from database.indexes import AggregationIndexes
-from database.models import WhiskeyDatabase, QueryInformation
+from database.models import WhiskeyDatabase, AsyncWhiskeyDatabase, AsyncQueryInformation
+from database.search import get_async_search_strategy, name_indexes
 
 D = TypeVar('D')
 
@@ -69,11 +71,7 @@ class IDisplayItemLeaf(ABC):
 
         if image_link := return_default_image(get_item_type(self.item.type)):
             embed.set_thumbnail(url=image_link)
-            embed.colour = rgb_tuple_to_discord_colour(
-                get_most_prominent_color_from_image(
-                    get_image_from_link(image_link)
-                )
-            )
+            embed.colour = colour_table.get(image_link) or discord.Colour.blurple()
         else:
             embed.colour = discord.Colour.blurple()
 
@@ -202,9 +200,13 @@ class ItemRootPaginatedNode(PageDataNodePromise):
             :class:`ItemCompositePageNode`
         """
         child_data: ItemComposite = child.data
-        items_leaf = WhiskeyDatabase(get_mongodb_client()).items_leaf
-        for leaf in child_data.leaves:
-            leaf_data = ItemLeaf.parse_obj(items_leaf.find_one({'_id': leaf.item_composite_leaf_id}))
+        leaf_documents = LeafLoader(WhiskeyDatabase(get_mongodb_client()).items_leaf).load(
+            [leaf.item_composite_leaf_id for leaf in child_data.leaves]
+        )
+        for leaf, leaf_document in zip(child_data.leaves, leaf_documents):
+            if leaf_document is None:
+                continue
+            leaf_data = ItemLeaf.parse_obj(leaf_document)
             leaf_name = f'{leaf_data.name} [{leaf.difference}] {"[Dye]" if leaf.has_dye is True else ""}'
             child.add_child(ItemLeafPagePromiseNode(
                 controller=child.controller,
@@ -246,7 +248,8 @@ class ItemDropdown(BetterSelectContainer):
 
     async def callback(self, interaction: Interaction):
         child_id, = self.values  # type: str
-        self.controller.goto_child(UUID(child_id))
+        # the leaves of a composite are loaded with blocking pymongo, see `generate_children_of`
+        await asyncio.to_thread(self.controller.goto_child, UUID(child_id))
 
 
 class ItemRootDisplayMessageContent(MessageContentDisplay):
@@ -338,21 +341,19 @@ class ItemLeafItemDisplayButton(ButtonItemsDisplay):
         return [GoBack(self.tree.controller)]
 
 
-def query_item(query: str) -> Optional[list[dict]]:
-    items_composite = WhiskeyDatabase(get_mongodb_client()).items_composite
-    matches: list[dict] = list(
-        TextSearch().query(
-            QueryInformation(collection=items_composite, to_search=query),
-            AggregationIndexes.ItemsCompositeString,
-            limit=25
-        )
+async def query_item(query: str) -> Optional[list[dict]]:
+    items_composite = AsyncWhiskeyDatabase(get_async_mongodb_client()).items_composite
+    matches: list[dict] = await get_async_search_strategy().query(
+        AsyncQueryInformation(collection=items_composite, to_search=query),
+        AggregationIndexes.ItemsCompositeString,
+        limit=25
     )
     if len(matches) > 0:
         return matches
 
 
 async def client(ctx: commands.Context, query_string: str):
-    if (matches := query_item(query_string)) is None:
+    if (matches := await query_item(query_string)) is None:
         raise CmdError('Item Not Found!', should_use_embed=True)
 
     controller = PageTreeController()
@@ -402,13 +403,10 @@ class ItemQueryCommands(commands.Cog):
         await interaction.response.defer()
         await client(await self.bot.get_context(interaction), query)
 
-    # @item_app_command.autocomplete('query')
-    # async def item_autocomplete(self, interation: Interaction, current: str) -> list[app_commands.Choice[str]]:
-    #     items_composite = WhiskeyDatabase(get_mongodb_client()).items_composite
-    #     raw_results: list[dict] = list(
-    #         EdgeGramSearch().query(QueryInformation(collection=items_composite, to_search=current), limit=5)
-    #     )[0:5]
-    #     return [app_commands.Choice(name=match, value=match) for match in (result['name'] for result in raw_results)]
+    @item_app_command.autocomplete('query')
+    async def item_autocomplete(self, interaction: Interaction, current: str) -> list[app_commands.Choice[str]]:
+        names = name_indexes[AggregationIndexes.ItemsCompositeString].complete(current, limit=25)
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
 
 
 async def setup(bot: commands.Bot):
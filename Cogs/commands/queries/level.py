@@ -1,16 +1,16 @@
 from textwrap import dedent, indent
-from typing import Optional, Generator, Generic, TypeVar
+from typing import Optional, Generic, TypeVar
 
 import discord
 from discord import Interaction, SelectOption, app_commands
 from discord.ext import commands
 from discord.ext.commands import Context as Ctx
-from scrapyscript import Job as ScrapyJob, Processor as ScrapyProcessor
 
 from Cogs.exceptions import CmdError
 from Utils.constants import images
-from Utils.dataclasses.levelling import LevellingInformation, ExpData
+from Utils.dataclasses.levelling import LevellingInformation, ExpData, LevellingTable
 from Utils.generics import arrays
+from Utils.generics.cache import AsyncTTLCache
 from Utils.generics.discord import to_message_data, send_with_paginator
 from Utils.generics.numbers import seperate_integer
 from Utils.paginator.buttons import BetterSelectContainer, SelectContainerData, GoBackTwice
@@ -19,10 +19,12 @@ from Utils.paginator.page.display import MessageContentDisplay, ButtonItemsDispl
 from Utils.paginator.page.models import TreeInformation
 from Utils.paginator.page.tree import PageDataTree, PageDataNode, PageDataNodePromise, PageTreeController
 from Utils.paginator.page.view import PaginatorView
+from database import get_async_mongodb_client
+from database.models import AsyncWhiskeyDatabase
 from scraper.spiders.converters import LevellingInformationConverter
 from scraper.spiders.parsers.coryn.levelling import LevellingCompositeParser
 from scraper.spiders.scrapers import ScraperInformation
-from scraper.spiders.scrapers.concrete_scrapers import CorynScraper
+from scraper.spiders.service import crawler_service
 
 D = TypeVar('D')
 
@@ -124,18 +126,35 @@ class LevellingRootButtonItems(ButtonItemsDisplay):
         return [LevellingNodeDropdown(self.tree.controller, select_container)]
 
 
-def scrape(level: int) -> Generator[LevellingInformation, None, None]:
+async def scrape(level: int) -> list[LevellingInformation]:
     scraper_information = ScraperInformation(
         url=f'https://coryn.club/leveling.php?lv={level}',
         parser=LevellingCompositeParser,
         next_page=False,
         converter=LevellingInformationConverter()
     )
+    return await crawler_service.scrape(scraper_information)
 
-    job = ScrapyJob(CorynScraper, scraper_information)
-    processor = ScrapyProcessor(settings=None)
-    for result in processor.run(job):
-        yield result['result']
+
+# levels whose table is not stored yet, popular levels are requested by many players at once
+# an empty table is not cached: a failed scrape resolves to no items and should be retried by the next request
+scrape_cache: AsyncTTLCache[int, list[LevellingInformation]] = AsyncTTLCache(maxsize=64, ttl=60 * 60, cache_if=bool)
+
+
+async def scrape_with_cache(level: int) -> list[LevellingInformation]:
+    return await scrape_cache.get_or_load(level, lambda: scrape(level))
+
+
+async def get_levelling_information(level: int) -> list[LevellingInformation]:
+    """Serves the levelling table stored by `LevellingMassScrape`, scraping and storing it on a miss"""
+    collection = AsyncWhiskeyDatabase(get_async_mongodb_client()).levelling_tables
+    if (document := await collection.find_one({'_id': level})) is not None:
+        return LevellingTable.parse_obj(document).information
+    if scraped := await scrape_with_cache(level):
+        await collection.replace_one(
+            {'_id': level}, LevellingTable(_id=level, information=scraped).dict(by_alias=True), upsert=True
+        )
+    return scraped
 
 
 def sort_by_mob_hierachy(mob_type: str):
@@ -149,7 +168,7 @@ def sort_by_mob_hierachy(mob_type: str):
 
 
 async def client(ctx: Ctx, level: int):
-    if not (scraped := list(scrape(level))):
+    if not (scraped := await get_levelling_information(level)):
         raise CmdError('Level Not Found!', should_use_embed=True)
 
     controller = PageTreeController()
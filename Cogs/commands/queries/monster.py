@@ -1,3 +1,4 @@
+import asyncio
 import textwrap
 from typing import Optional, TypeVar, Generator
 from uuid import UUID
@@ -14,10 +15,11 @@ from Utils.generics.discord import to_message_data, send_with_paginator
 from Utils.paginator.buttons import GoBack, BetterSelectContainer, SelectContainerData, GoLeft, GoRight, GoFirst, GoLast
 from Utils.paginator.page import PageDataNode, PageDataNodePromise, PageDataTree, TreeInformation, DisplayData, \
     ButtonItemsDisplay, MessageContentDisplay, PageTreeController, PaginatorView
-from database import get_mongodb_client
-from database.command.read import TextSearch
+from database import get_mongodb_client, get_async_mongodb_client
+from database.command.read import LeafLoader
 from database.indexes import AggregationIndexes
-from database.models import WhiskeyDatabase, QueryInformation
+from database.models import WhiskeyDatabase, AsyncWhiskeyDatabase, AsyncQueryInformation
+from database.search import get_async_search_strategy, name_indexes
 
 D = TypeVar('D')
 
@@ -26,7 +28,8 @@ class ItemDropdown(BetterSelectContainer):
 
     async def callback(self, interaction: Interaction):
         child_id, = self.values  # type: str
-        self.controller.goto_child(UUID(child_id))
+        # the leaves of a composite are loaded with blocking pymongo, see `generate_children_of`
+        await asyncio.to_thread(self.controller.goto_child, UUID(child_id))
 
 
 class MonsterPageRootNode(PageDataNode):
@@ -55,11 +58,13 @@ class MonsterPaginatedRootNode(PageDataNodePromise):
     @staticmethod
     def generate_children_of(child: PageDataTree) -> PageDataTree:
         child_data: MonsterComposite = child.data
-        monsters_leaf_db_collection = WhiskeyDatabase(get_mongodb_client()).monsters_leaf
-        for monster_leaf in child_data.leaves:
-            monster_leaf_data = MonsterLeaf.parse_obj(
-                monsters_leaf_db_collection.find_one({'_id': monster_leaf.monster_composite_leaf_id})
-            )
+        monster_leaf_documents = LeafLoader(WhiskeyDatabase(get_mongodb_client()).monsters_leaf).load(
+            [monster_leaf.monster_composite_leaf_id for monster_leaf in child_data.leaves]
+        )
+        for monster_leaf_document in monster_leaf_documents:
+            if monster_leaf_document is None:
+                continue
+            monster_leaf_data = MonsterLeaf.parse_obj(monster_leaf_document)
             child.add_child(MonsterLeafPagePromiseNode(
                 controller=child.controller,
                 information=TreeInformation(name=monster_leaf_data.name),
@@ -205,21 +210,19 @@ class ItemLeafItemDisplayButton(ButtonItemsDisplay):
         return [GoBack(self.tree.controller)]
 
 
-def query_monster(query: str) -> Optional[list[dict]]:
-    monsters_composite_collection = WhiskeyDatabase(get_mongodb_client()).monsters_composite
-    matches: list[dict] = list(
-        TextSearch().query(
-            QueryInformation(collection=monsters_composite_collection, to_search=query),
-            AggregationIndexes.MonstersCompositeString,
-            limit=25
-        )
+async def query_monster(query: str) -> Optional[list[dict]]:
+    monsters_composite_collection = AsyncWhiskeyDatabase(get_async_mongodb_client()).monsters_composite
+    matches: list[dict] = await get_async_search_strategy().query(
+        AsyncQueryInformation(collection=monsters_composite_collection, to_search=query),
+        AggregationIndexes.MonstersCompositeString,
+        limit=25
     )
     if len(matches) > 0:
         return matches
 
 
 async def client(ctx: commands.Context, query_string: str):
-    if (matches := query_monster(query_string)) is None:
+    if (matches := await query_monster(query_string)) is None:
         raise CmdError('Monster Not Found!', should_use_embed=True)
 
     controller = PageTreeController()
@@ -270,6 +273,11 @@ class MonsterQueryCommands(commands.Cog):
         await interaction.response.defer()
         await client(await self.bot.get_context(interaction), query)
 
+    @monster_app_command.autocomplete('query')
+    async def monster_autocomplete(self, interaction: Interaction, current: str) -> list[app_commands.Choice[str]]:
+        names = name_indexes[AggregationIndexes.MonstersCompositeString].complete(current, limit=25)
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names]
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(MonsterQueryCommands(bot))
@@ -5,61 +5,69 @@ from pymongo.results import DeleteResult
 from pymongo.results import InsertManyResult
 
 from Utils.dataclasses.guild import Guild
-from database import get_mongodb_client, mongo_collection
-from database.models import WhiskeyDatabase
+from database import get_async_mongodb_client, motor_collection
+from database.models import AsyncWhiskeyDatabase
 
 
 class GuildDatabase:
 
-    def __init__(self, collection: mongo_collection):
+    def __init__(self, collection: motor_collection):
         self.collection = collection
 
-    def add(self, guilds: list[Guild]) -> InsertManyResult:
-        return self.collection.insert_many([guild.dict(by_alias=True) for guild in guilds])
+    async def add(self, guilds: list[Guild]) -> InsertManyResult:
+        return await self.collection.insert_many([guild.dict(by_alias=True) for guild in guilds])
 
-    def remove(self, guild_ids: list[int]) -> DeleteResult:
-        return self.collection.delete_many({'_id': {'$in': guild_ids}})
+    async def remove(self, guild_ids: list[int]) -> DeleteResult:
+        return await self.collection.delete_many({'_id': {'$in': guild_ids}})
 
 
 class System(commands.Cog, name='system'):
     def __init__(self, bot):
         self.bot: commands.Bot = bot
-        self.collection: mongo_collection = WhiskeyDatabase(get_mongodb_client()).discord_guilds
+        self.collection: motor_collection = AsyncWhiskeyDatabase(get_async_mongodb_client()).discord_guilds
 
-    def add_not_added_guilds(self, bot: commands.Bot):
-        guilds_not_added: list[Guild] = [
-            Guild(_id=guild.id) for guild in bot.guilds if self.collection.count_documents({'_id': guild.id}) == 0
-        ]
+    async def add_not_added_guilds(self, bot: commands.Bot):
+        added: set[int] = set(await self.collection.distinct('_id'))
+        guilds_not_added: list[Guild] = [Guild(_id=guild.id) for guild in bot.guilds if guild.id not in added]
         if guilds_not_added:
-            GuildDatabase(collection=self.collection).add(guilds_not_added)
+            await GuildDatabase(collection=self.collection).add(guilds_not_added)
+            for guild in guilds_not_added:
+                self.bot.prefix_cache.set(guild.id, guild.prefix)
 
-    def remove_invalid_guild_in_database(self, bot: commands.Bot):
+    async def remove_invalid_guild_in_database(self, bot: commands.Bot):
         """This functions checks whether a guild in the database isn't a joined guild and removes them
         """
-        added_that_are_not_exempted: list[int] = [guild['_id'] for guild in self.collection.find({'exempted': False})]
+        added_that_are_not_exempted: list[int] = [
+            guild['_id'] async for guild in self.collection.find({'exempted': False}, {'_id': 1})
+        ]
 
         # current joined guilds of the bot
         not_joined: list[int] = [guild.id for guild in bot.guilds if guild.id not in added_that_are_not_exempted]
         if not_joined:
-            GuildDatabase(collection=self.collection).remove(not_joined)
+            await GuildDatabase(collection=self.collection).remove(not_joined)
+            for guild_id in not_joined:
+                self.bot.prefix_cache.remove(guild_id)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
+        new_guild = Guild(_id=guild.id)
         try:
-            self.collection.insert_one(Guild(_id=guild.id).dict(by_alias=True))
+            await self.collection.insert_one(new_guild.dict(by_alias=True))
         except pymongo.errors.DuplicateKeyError:
-            pass
+            return
+        self.bot.prefix_cache.set(new_guild.id, new_guild.prefix)
 
     @commands.Cog.listener()
     async def on_guild_remove(self, guild):
-        self.collection.delete_one({"_id": guild.id})
+        await self.collection.delete_one({"_id": guild.id})
+        self.bot.prefix_cache.remove(guild.id)
 
     @commands.Cog.listener()
     async def on_ready(self):
         self.change_presence_every_minute.start()
         if self.bot.application_id == 876662819511218207:
-            self.remove_invalid_guild_in_database(self.bot)
-            self.add_not_added_guilds(self.bot)
+            await self.remove_invalid_guild_in_database(self.bot)
+            await self.add_not_added_guilds(self.bot)
 
     @tasks.loop(minutes=1)
     async def change_presence_every_minute(self):
@@ -6,7 +6,7 @@ from typing import Type, Optional, TypeAlias
 from bson import ObjectId
 from pydantic import BaseModel as PydanticBaseModel, BaseConfig, Extra
 
-from scraper.spiders.parsers.models import ParserResults, ParserResultWrapper
+from scraper.spiders.parsers.models import ParserResults, ParserResultWrapper, LeafResult
 
 DyeType: TypeAlias = tuple[str | int, str | int, str | int]
 
@@ -27,7 +27,8 @@ def dataclass_factory(item: ParserResultWrapper, model: Type[WikiBaseModel]) ->
     """builder for :class:`PydanticBaseModel`"""
     data = {}
     for result in item['result']:
-        result = ParserResults.parse_obj(result)
+        if isinstance(result, LeafResult) is False:
+            result = ParserResults.parse_obj(result)
         data.update({result.parser['name']: result.result})
 
     return model.parse_obj(data)
@@ -1,5 +1,8 @@
+from datetime import datetime
 from typing import TypedDict
 
+from pydantic import Field
+
 from Utils.types import OptionalStr, IdStringPair
 from .abc import WikiBaseConfig, WikiBaseModel
 from ..generics.strings import remove_underscores
@@ -16,3 +19,10 @@ class LevellingInformation(WikiBaseModel):
 
     class Config(WikiBaseConfig):
         alias_generator = remove_underscores
+
+
+class LevellingTable(WikiBaseModel):
+    """Every :class:`LevellingInformation` of a level as stored in the database"""
+    level: int = Field(..., alias='_id')
+    information: list[LevellingInformation]
+    scraped_at: datetime = Field(default_factory=datetime.utcnow)
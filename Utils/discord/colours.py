@@ -0,0 +1,88 @@
+"""Persistent table of the accent colour of every default item image"""
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Iterable
+
+import discord
+
+from Utils.dataclasses.abc import ItemType
+from Utils.dataclasses.item import return_default_image
+from Utils.generics.discord import get_image_from_link, get_most_prominent_color_from_image, \
+    rgb_tuple_to_discord_colour
+
+DEFAULT_PATH = Path(__file__).parents[2] / 'data' / 'image_colours.json'
+
+
+def default_image_urls() -> set[str]:
+    """every image url returned by :func:`return_default_image`"""
+    return {url for url in (return_default_image(item_type) for item_type in ItemType) if url}
+
+
+class ImageColourTable:
+    """Maps an image url to its most prominent colour so that rendering never downloads or analyses images
+
+    Entries are computed by :meth:`refresh` (at startup or from the command line) and persisted as json.
+    An entry older than :param ttl: is recomputed by the next refresh.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, ttl: timedelta = timedelta(days=7)):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._colours: dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            self._colours = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._colours = {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._colours, indent=2))
+
+    def get(self, url: str) -> Optional[discord.Colour]:
+        if (entry := self._colours.get(url)) is None:
+            return
+        return rgb_tuple_to_discord_colour(tuple(entry['rgb']))
+
+    def is_stale(self, url: str) -> bool:
+        if (entry := self._colours.get(url)) is None:
+            return True
+        return datetime.utcnow() - datetime.fromisoformat(entry['computed_at']) > self.ttl
+
+    def compute(self, url: str) -> tuple[int, int, int]:
+        rgb = get_most_prominent_color_from_image(get_image_from_link(url))
+        self._colours[url] = {'rgb': list(rgb), 'computed_at': datetime.utcnow().isoformat()}
+        return rgb
+
+    def refresh(self, urls: Iterable[str], *, force: bool = False) -> int:
+        """Computes missing and stale entries of :param urls: and persists the table
+
+        Returns:
+            The number of entries that were computed
+        """
+        with self._lock:
+            computed = 0
+            for url in urls:
+                if force is False and self.is_stale(url) is False:
+                    continue
+                try:
+                    self.compute(url)
+                except Exception as exc:  # a dead link must not stop the other entries
+                    print(f'Could not compute the colour of {url}: {exc}')
+                    continue
+                computed += 1
+            if computed:
+                self.save()
+            return computed
+
+
+colour_table = ImageColourTable()
+
+
+if __name__ == '__main__':
+    print(f'Computed {colour_table.refresh(default_image_urls(), force=True)} colours into {colour_table.path}')
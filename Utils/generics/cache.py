@@ -0,0 +1,76 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Callable, Awaitable, NamedTuple, Hashable
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    coalesced: int  # requests that awaited an in-flight load instead of starting their own
+    size: int
+    in_flight: int
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after :param ttl: seconds
+
+    Concurrent misses for the same key share a single load. A load that raises, or whose value fails
+    :param cache_if:, is returned to its callers without being cached.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600, cache_if: Callable[[V], bool] = lambda _: True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_if = cache_if
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._in_flight: dict[K, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.coalesced, len(self._entries), len(self._in_flight))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get(self, key: K) -> tuple[bool, V]:
+        if (entry := self._entries.get(key)) is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _set(self, key: K, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        found, value = self._get(key)
+        if found is True:
+            self.hits += 1
+            return value
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+
+            def on_done(done: asyncio.Task):
+                del self._in_flight[key]
+                if not done.cancelled() and done.exception() is None and self.cache_if(done.result()):
+                    self._set(key, done.result())
+            task.add_done_callback(on_done)
+        # shielded so that a cancelled caller does not cancel the load for the others
+        return await asyncio.shield(task)
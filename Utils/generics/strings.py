@@ -55,3 +55,20 @@ def convert_json_string_to_dict(string: str) -> dict:
 def is_valid_enum_value(string: str, enum: Type[Enum]) -> bool:
     """check if a string is a valid enum value"""
     return string in [member.value for member in enum.__members__.values()]
+
+
+def edit_distance(first: str, second: str) -> int:
+    """levenshtein distance between two strings"""
+    if len(first) < len(second):
+        first, second = second, first
+    previous_row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, start=1):
+        current_row = [i]
+        for j, second_char in enumerate(second, start=1):
+            current_row.append(min(
+                previous_row[j] + 1,  # deletion
+                current_row[j - 1] + 1,  # insertion
+                previous_row[j - 1] + (first_char != second_char)  # substitution
+            ))
+        previous_row = current_row
+    return previous_row[-1]
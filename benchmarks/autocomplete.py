@@ -0,0 +1,62 @@
+"""Per-keystroke latency of :meth:`database.search.NameIndex.complete`"""
+import random
+import statistics
+import time
+
+from database.search import NameIndex
+
+WORDS = (
+    'dragon', 'goblin', 'pomie', 'iron', 'mage', 'magic', 'stone', 'tooth', 'scale', 'wing', 'ear', 'fur', 'ore',
+    'blade', 'staff', 'bow', 'knuckles', 'halberd', 'katana', 'crysta', 'armor', 'helm', 'ring', 'shield', 'dark',
+    'light', 'fire', 'water', 'wind', 'earth', 'ancient', 'cursed', 'holy', 'king', 'queen', 'golem', 'spirit'
+)
+
+
+def generate_names(amount: int, seed: int = 0) -> list[str]:
+    generator = random.Random(seed)
+    return [
+        ' '.join(generator.choice(WORDS).title() for _ in range(generator.randint(1, 4))) + f' {index}'
+        for index in range(amount)
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run(amount: int = 10_000, queries: int = 500):
+    names = generate_names(amount)
+    name_index = NameIndex()
+    started = time.perf_counter()
+    name_index.build({'_id': index, 'name': name} for index, name in enumerate(names))
+    print(f'built index of {amount} names in {(time.perf_counter() - started) * 1000:.1f}ms')
+
+    generator = random.Random(1)
+    latencies = []
+    for name in generator.sample(names, queries):
+        for end in range(1, len(name) + 1):  # every keystroke of the name
+            started = time.perf_counter()
+            name_index.complete(name[:end], limit=25)
+            latencies.append(time.perf_counter() - started)
+
+    report('prefix keystrokes', latencies)
+
+    latencies = []
+    for name in generator.sample(names, queries):
+        typo = name[:len(name) // 2] + name[len(name) // 2 + 1:]  # a dropped character forces the fuzzy fallback
+        started = time.perf_counter()
+        name_index.complete(typo, limit=25)
+        latencies.append(time.perf_counter() - started)
+    report('misspelled names', latencies)
+
+
+def report(label: str, latencies: list[float]):
+    to_ms = 1000
+    print(f'{len(latencies)} {label}: '
+          f'p50 {statistics.median(latencies) * to_ms:.3f}ms '
+          f'p99 {percentile(latencies, 0.99) * to_ms:.3f}ms '
+          f'max {max(latencies) * to_ms:.3f}ms')
+
+
+if __name__ == '__main__':
+    run()
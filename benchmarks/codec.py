@@ -0,0 +1,77 @@
+"""Memento documents decoded per second by :class:`database.codec.CollectionCodec`
+
+Resolves the collection strings against the MongoDB of `config/database/mongodb.yaml`, once through the cached
+:data:`database.codec.namespace_catalog` and once with :class:`ListingCollectionCodec`, the codec as it was before
+the catalog, which listed the databases and the collections of the decoded database for every string.
+"""
+import time
+
+import bson
+from bson import CodecOptions
+from bson.codec_options import TypeRegistry
+
+from database import get_mongodb_client
+from database.codec import CollectionCodec, namespace_catalog, split_collection_full_name
+from database.exceptions import DatabaseNotFound, CollectionNotFound
+from database.types import mongo_collection
+
+
+def listed_collection_string_to_obj(collection_string: str) -> mongo_collection:
+    mongo_client = get_mongodb_client()
+    db, collection = split_collection_full_name(collection_string)
+    if db not in mongo_client.list_database_names():
+        raise DatabaseNotFound(db)
+    if collection not in mongo_client[db].list_collection_names():
+        raise CollectionNotFound(collection)
+    return get_mongodb_client()[db][collection]
+
+
+class ListingCollectionCodec(CollectionCodec):
+    def transform_bson(self, value: str) -> str | mongo_collection:
+        try:
+            return listed_collection_string_to_obj(value)
+        except (DatabaseNotFound, CollectionNotFound, ValueError):
+            return value
+
+
+CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([CollectionCodec()]))
+LISTING_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([ListingCollectionCodec()]))
+
+
+def memento_documents(collection_string: str, amount: int) -> list[bytes]:
+    return [
+        bson.encode({
+            'position': position,
+            'command': {
+                'name': 'InsertOne',
+                'collection': collection_string,
+                'data': {'_id': position, 'name': f'Item {position}', 'note': 'a string with a dot. not a collection'}
+            }
+        }) for position in range(1, amount + 1)
+    ]
+
+
+def decode(documents: list[bytes], codec_options: CodecOptions) -> float:
+    started = time.perf_counter()
+    for document in documents:
+        bson.decode(document, codec_options=codec_options)
+    return time.perf_counter() - started
+
+
+def run(amount: int = 10_000, listing_amount: int = 100):
+    collection = get_mongodb_client().benchmarks.codec
+    collection.insert_one({})  # the collection has to exist to be resolved
+    try:
+        namespace_catalog.invalidate()
+        elapsed = decode(memento_documents(collection.full_name, amount), CODEC_OPTIONS)
+        print(f'cached catalog: {amount} documents in {elapsed:.3f}s, {amount / elapsed:.0f} documents/s')
+
+        elapsed = decode(memento_documents(collection.full_name, listing_amount), LISTING_CODEC_OPTIONS)
+        print(f'listed for every string: {listing_amount} documents in {elapsed:.3f}s, '
+              f'{listing_amount / elapsed:.0f} documents/s')
+    finally:
+        collection.database.client.drop_database(collection.database.name)
+
+
+if __name__ == '__main__':
+    run()
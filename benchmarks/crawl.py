@@ -0,0 +1,45 @@
+"""Pages per second of the sequential next-page chain against the sharded crawl of a coryn listing
+
+Runs against the live site, keep :param pages: small.
+"""
+import time
+
+from scrapy.crawler import CrawlerRunner
+from scrapy.settings import Settings
+from twisted.internet import defer, reactor
+
+from scraper.spiders.parsers.coryn.item import ItemCompositeParser
+from scraper.spiders.scrapers import ScraperInformation
+from scraper.spiders.scrapers.concrete_scrapers import CorynScraper, ShardedCorynScraper, sharded_crawl_settings
+
+LISTING_URL = 'https://coryn.club/item.php?&show=250&order=name&p=0'
+
+
+def scraper_information() -> ScraperInformation:
+    return ScraperInformation(url=LISTING_URL, parser=ItemCompositeParser, next_page=True)
+
+
+@defer.inlineCallbacks
+def crawl(spider, settings: dict, label: str):
+    runner = CrawlerRunner(Settings(settings))
+    crawler = runner.create_crawler(spider)
+    started = time.perf_counter()
+    yield runner.crawl(crawler, scraper_information())
+    elapsed = time.perf_counter() - started
+    pages = crawler.stats.get_value('response_received_count', 0)
+    print(f'{label}: {pages} pages in {elapsed:.2f}s, {pages / elapsed:.2f} pages/s')
+
+
+@defer.inlineCallbacks
+def run(pages: int = 20, concurrency: int = 8):
+    settings = {'CLOSESPIDER_PAGECOUNT': pages, 'LOG_ENABLED': False}
+    try:
+        yield crawl(CorynScraper, settings, 'sequential')
+        yield crawl(ShardedCorynScraper, settings | sharded_crawl_settings(concurrency), f'sharded x{concurrency}')
+    finally:
+        reactor.stop()
+
+
+if __name__ == '__main__':
+    run()
+    reactor.run()
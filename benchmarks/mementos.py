@@ -0,0 +1,112 @@
+"""Commands registered and documents replayed per second by :class:`database.command.write.DatabaseOperations`
+
+Runs against the MongoDB of `config/database/mongodb.yaml` in the scratch database `benchmarks`, which is dropped
+afterwards. Round trips are counted with a pymongo command listener.
+"""
+import time
+from collections import Counter
+
+from bson import CodecOptions
+from bson.codec_options import TypeRegistry
+from pymongo import MongoClient, monitoring
+
+from database.client import client_registry
+from database.codec import CollectionCodec
+from database.command.write import DatabaseOperations, InsertOne, InsertMany
+
+DATABASE = 'benchmarks'
+MEMENTO_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([CollectionCodec()]))
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands: Counter = Counter()
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def run(amount: int = 1_000, undo_every: int = 10):
+    counter = CommandCounter()
+    mongo_client = MongoClient(client_registry.config.connection_string, event_listeners=[counter])
+    mongo_client.drop_database(DATABASE)
+    try:
+        target = mongo_client[DATABASE].target
+        controller = DatabaseOperations(
+            mongo_client[DATABASE].get_collection('mementos', codec_options=MEMENTO_CODEC_OPTIONS)
+        )
+        controller.ensure_indexes()
+        counter.commands.clear()
+
+        started = time.perf_counter()
+        for index in range(amount):
+            controller.register(InsertOne(collection=target, data={'index': index}))
+            if index % undo_every == undo_every - 1:  # the next command drops the undone memento
+                controller.undo()
+        elapsed = time.perf_counter() - started
+
+        round_trips = sum(counter.commands.values())
+        print(f'registered {amount} commands in {elapsed:.2f}s, {amount / elapsed:.0f} commands/s, '
+              f'{round_trips / amount:.2f} round trips per command')
+        print('  ' + ', '.join(f'{name}: {count}' for name, count in counter.commands.most_common()))
+
+        target.delete_many({})  # the collection is kept, the codec only decodes existing collections
+        started = time.perf_counter()
+        for memento in controller.fetch_mementos():
+            memento.command.execute()
+        elapsed = time.perf_counter() - started
+        documents = target.count_documents({})
+        target.delete_many({})
+        report = controller.execute_commands()
+        print(f'replayed {documents} documents one command at a time at {documents / elapsed:.0f} documents/s, '
+              f'{report.documents} in {report.bulk_writes} bulk writes at {report.documents_per_second:.0f} '
+              f'documents/s')
+    finally:
+        mongo_client.drop_database(DATABASE)
+        mongo_client.close()
+
+
+def collection_size(collection) -> int:
+    return collection.database.command('collStats', collection.name).get('size', 0)
+
+
+def compare_payload_sizes(runs: int = 3, batch_size: int = 25):
+    """Size of the mementos of :param runs: identical scrapes of the item fixture, with and without payloads"""
+    from benchmarks.parsers import FIXTURE_PARSERS, load_fixture
+
+    fixture = FIXTURE_PARSERS[0]
+    documents = [
+        item.dict(by_alias=True)
+        for item in fixture.parser(fixture.parser.container_path, fixture.converter).parse(load_fixture(fixture.page))
+    ]
+    mongo_client = MongoClient(client_registry.config.connection_string)
+    mongo_client.drop_database(DATABASE)
+    try:
+        target = mongo_client[DATABASE].target
+        for store_payloads in (False, True):
+            mementos = mongo_client[DATABASE].get_collection(
+                f'mementos.{store_payloads}', codec_options=MEMENTO_CODEC_OPTIONS
+            )
+            controller = DatabaseOperations(mementos, store_payloads=store_payloads)
+            for _ in range(runs):
+                for start in range(0, len(documents), batch_size):
+                    controller.register(InsertMany(collection=target, data=documents[start:start + batch_size]))
+            size = collection_size(mementos)
+            if controller.payloads is not None:
+                size += collection_size(controller.payloads.collection)
+            print(f'{runs} scrapes of {len(documents)} items, payloads {"stored once" if store_payloads else "inline"}:'
+                  f' {size / 1024:.0f}KiB')
+    finally:
+        mongo_client.drop_database(DATABASE)
+        mongo_client.close()
+
+
+if __name__ == '__main__':
+    run()
+    compare_payload_sizes()
@@ -0,0 +1,116 @@
+"""Time and allocations of the coryn composite parsers and their leaves over the fixture pages
+
+The fixtures in `benchmarks/fixtures/coryn` follow the markup targeted by the parsers, they can be swapped for
+real pages recorded with :class:`scraper.spiders.response_store.ResponseStore`.
+"""
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Type, NamedTuple
+
+from scrapy.http import HtmlResponse
+
+from scraper.spiders.converters import IDataclassFactory, ItemInformationConverter, MonsterInformationConverter, \
+    LevellingInformationConverter
+from scraper.spiders.parsers.abc import CompositeParser
+from scraper.spiders.parsers.coryn.item import ItemCompositeParser
+from scraper.spiders.parsers.coryn.levelling import LevellingCompositeParser
+from scraper.spiders.parsers.coryn.monster import MonsterCompositeParser
+from scraper.spiders.parsers.generics import compiled_selector_from, xpath_registry
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'coryn'
+
+
+class Fixture(NamedTuple):
+    page: str
+    parser: Type[CompositeParser]
+    converter: IDataclassFactory
+
+
+FIXTURE_PARSERS = (
+    Fixture('item', ItemCompositeParser, ItemInformationConverter()),
+    Fixture('monster', MonsterCompositeParser, MonsterInformationConverter()),
+    Fixture('leveling', LevellingCompositeParser, LevellingInformationConverter())
+)
+
+
+def load_fixture(page: str) -> HtmlResponse:
+    return HtmlResponse(
+        url=f'https://coryn.club/{page}.php', body=(FIXTURES / f'{page}.html').read_bytes(), encoding='utf-8'
+    )
+
+
+def time_composite(fixture: Fixture, response: HtmlResponse, repeat: int) -> tuple[int, float]:
+    """
+    Returns:
+        The number of containers of the page and the best time of :param repeat: full parses
+    """
+    best, containers = float('inf'), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        containers = sum(1 for _ in fixture.parser(fixture.parser.container_path, fixture.converter).parse(response))
+        best = min(best, time.perf_counter() - started)
+    return containers, best
+
+
+def time_leaves(fixture: Fixture, response: HtmlResponse, repeat: int) -> dict[str, float]:
+    """best time of every leaf parser over all the containers of the page"""
+    containers = compiled_selector_from(response).xpath(fixture.parser.container_path.get())
+    timings: dict[str, float] = defaultdict(lambda: float('inf'))
+    for parser in fixture.parser.parsers:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for container in containers:
+                parser.get_result(container, response)
+            timings[parser.name] = min(timings[parser.name], time.perf_counter() - started)
+    return timings
+
+
+def measure_allocations(fixture: Fixture, response: HtmlResponse) -> tuple[int, int]:
+    """
+    Returns:
+        The peak traced memory and the number of allocated blocks still alive after a full parse
+    """
+    tracemalloc.start()
+    try:
+        results = list(fixture.parser(fixture.parser.container_path, fixture.converter).parse(response))
+        blocks = sum(statistic.count for statistic in tracemalloc.take_snapshot().statistics('filename'))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return peak, blocks
+
+
+def compare_compiled_xpath(fixture: Fixture, response: HtmlResponse, repeat: int) -> tuple[float, float]:
+    """
+    Returns:
+        The best time of a full parse with `Selector.xpath` and with :data:`xpath_registry`
+    """
+    xpath_registry.enabled = False
+    try:
+        _, uncompiled = time_composite(fixture, response, repeat)
+    finally:
+        xpath_registry.enabled = True
+    _, compiled = time_composite(fixture, response, repeat)
+    return uncompiled, compiled
+
+
+def run(repeat: int = 5):
+    for fixture in FIXTURE_PARSERS:
+        response = load_fixture(fixture.page)
+        containers, elapsed = time_composite(fixture, response, repeat)
+        peak, blocks = measure_allocations(fixture, response)
+        print(f'{fixture.parser.__name__}: {containers} containers in {elapsed * 1000:.1f}ms, '
+              f'{containers / elapsed:.0f} containers/s, peak {peak / 1024:.0f}KiB, {blocks} live blocks')
+        leaves = time_leaves(fixture, response, repeat)
+        for name, leaf_elapsed in sorted(leaves.items(), key=lambda pair: pair[1], reverse=True):
+            print(f'  {name:<16} {leaf_elapsed * 1000:8.2f}ms {leaf_elapsed / elapsed:6.1%}')
+        uncompiled, compiled = compare_compiled_xpath(fixture, response, repeat)
+        print(f'  compiled xpath: {uncompiled * 1000:.1f}ms -> {compiled * 1000:.1f}ms per page, '
+              f'{uncompiled / compiled:.2f}x')
+
+
+if __name__ == '__main__':
+    run()
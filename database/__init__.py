@@ -1,15 +1,24 @@
-from hydra import compose, initialize
-from omegaconf import DictConfig
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 
-from database.codec import CollectionCodec
+from database.client import client_registry
+from database.codec import CollectionCodec, namespace_catalog
 from database.exceptions import DatabaseNotFound, CollectionNotFound
-from database.types import mongo_collection, mongo_database
+from database.types import mongo_collection, mongo_database, motor_collection, motor_database
 
 global_dict = {}
 
 
 def get_mongodb_client() -> MongoClient:
-    with initialize(config_path='../config/database/'):
-        cfg: DictConfig = compose(config_name='mongodb')
-        return MongoClient(cfg.connection_string)
+    """Returns the shared, pooled client of the process"""
+    return client_registry.get()
+
+
+def get_async_mongodb_client() -> AsyncIOMotorClient:
+    """Returns the shared, pooled asyncio client of the process"""
+    return client_registry.get_async()
+
+
+def close_mongodb_clients() -> None:
+    client_registry.close()
+    namespace_catalog.invalidate()  # the resolved collections belong to the closed client
@@ -0,0 +1,73 @@
+"""In-memory caches in front of the database"""
+import asyncio
+from typing import Optional
+
+from pymongo.errors import PyMongoError
+
+from database.types import motor_collection
+
+DEFAULT_PREFIX = '$'
+
+
+class GuildPrefixCache:
+    """Maps a guild id to its prefix so that message dispatch never touches the database
+
+    The cache is bulk-loaded with :meth:`load`, kept up to date write-through by whoever changes
+    the `discord.guilds` collection and can optionally follow a change stream with :meth:`watch`.
+    """
+
+    def __init__(self):
+        self._prefixes: dict[int, str] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._prefixes
+
+    def get(self, guild_id: int) -> Optional[str]:
+        return self._prefixes.get(guild_id)
+
+    def set(self, guild_id: int, prefix: str) -> None:
+        self._prefixes[guild_id] = prefix
+
+    def remove(self, guild_id: int) -> None:
+        self._prefixes.pop(guild_id, None)
+
+    async def load(self, collection: motor_collection) -> None:
+        """Replaces the cache with every guild prefix stored in :param collection:"""
+        self._prefixes = {guild['_id']: guild['prefix'] async for guild in collection.find({}, {'prefix': 1})}
+
+    async def fetch(self, collection: motor_collection, guild_id: int, default: str = DEFAULT_PREFIX) -> str:
+        """Read-through for guilds that were not loaded yet
+
+        A guild without a document gets :param default:, which is cached too so that its next messages
+        do not query the database again.
+        """
+        guild = await collection.find_one({'_id': guild_id}, {'prefix': 1})
+        prefix = default if guild is None else guild['prefix']
+        self.set(guild_id, prefix)
+        return prefix
+
+    def watch(self, collection: motor_collection) -> None:
+        """Follows the change stream of :param collection: in the background, requires a replica set"""
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch(collection))
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    async def _watch(self, collection: motor_collection) -> None:
+        try:
+            async with collection.watch(full_document='updateLookup') as stream:
+                async for change in stream:
+                    guild_id = change['documentKey']['_id']
+                    if change['operationType'] == 'delete':
+                        self.remove(guild_id)
+                    elif (document := change.get('fullDocument')) is not None:
+                        self.set(guild_id, document['prefix'])
+        except PyMongoError as exc:  # change streams are unavailable on standalone servers
+            print(f'Guild prefix change stream stopped: {exc}')
@@ -0,0 +1,108 @@
+"""Process-wide MongoClient registry"""
+import threading
+from typing import Optional
+
+from hydra import compose, initialize
+from motor.motor_asyncio import AsyncIOMotorClient
+from omegaconf import DictConfig
+from pymongo import MongoClient, monitoring
+
+
+def load_mongodb_config() -> DictConfig:
+    with initialize(config_path='../config/database/'):
+        return compose(config_name='mongodb')
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts the commands sent by each thread through the registered :class:`MongoClient`
+
+    pymongo publishes the events of a command on the thread that sends it, so the difference of :attr:`count`
+    around a block is the number of round trips that block made.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def count(self) -> int:
+        return getattr(self._local, 'count', 0)
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self._local.count = self.count + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+round_trip_counter = RoundTripCounter()
+
+
+class MongoClientRegistry:
+    """Holds one pooled :class:`MongoClient` (and one :class:`AsyncIOMotorClient`) per connection string
+    for the lifetime of the process
+
+    pymongo clients are thread-safe and own their connection pool, so every consumer of
+    :class:`database.models.WhiskeyDatabase` should share the client returned by :meth:`get`
+    instead of building a new one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config: Optional[DictConfig] = None
+        self._clients: dict[str, MongoClient] = {}
+        self._async_clients: dict[str, AsyncIOMotorClient] = {}
+
+    @property
+    def config(self) -> DictConfig:
+        if self._config is None:
+            self.configure(load_mongodb_config())
+        return self._config
+
+    def configure(self, config: DictConfig) -> None:
+        """Sets the configuration used for clients created from now on"""
+        self._config = config
+
+    @property
+    def client_count(self) -> int:
+        """The number of clients, and therefore connection pools, currently alive"""
+        return len(self._clients) + len(self._async_clients)
+
+    def get_pool_options(self) -> dict:
+        pool = self.config.get('pool', {})
+        return {
+            'maxPoolSize': pool.get('max_pool_size', 100),
+            'minPoolSize': pool.get('min_pool_size', 0),
+            'maxIdleTimeMS': pool.get('max_idle_time_ms', None)
+        }
+
+    def get(self, connection_string: Optional[str] = None) -> MongoClient:
+        return self._get_or_create(
+            self._clients, MongoClient, connection_string, event_listeners=[round_trip_counter]
+        )
+
+    def get_async(self, connection_string: Optional[str] = None) -> AsyncIOMotorClient:
+        return self._get_or_create(self._async_clients, AsyncIOMotorClient, connection_string)
+
+    def _get_or_create(self, clients: dict, client_cls, connection_string: Optional[str], **options):
+        connection_string = connection_string or self.config.connection_string
+        if (mongo_client := clients.get(connection_string)) is not None:
+            return mongo_client
+        with self._lock:
+            if (mongo_client := clients.get(connection_string)) is None:
+                mongo_client = client_cls(connection_string, **self.get_pool_options(), **options)
+                clients[connection_string] = mongo_client
+            return mongo_client
+
+    def close(self) -> None:
+        """Closes every registered client and their connection pools"""
+        with self._lock:
+            for mongo_client in [*self._clients.values(), *self._async_clients.values()]:
+                mongo_client.close()
+            self._clients.clear()
+            self._async_clients.clear()
+
+
+client_registry = MongoClientRegistry()
@@ -1,5 +1,10 @@
+import threading
+import time
+from typing import Optional
+
 import discord
 from bson.codec_options import TypeCodec
+from pymongo.errors import PyMongoError
 
 import database
 from database.exceptions import DatabaseNotFound, CollectionNotFound
@@ -29,14 +34,70 @@ def is_collection_string(string: str) -> bool:
     return True
 
 
+class NamespaceCatalog:
+    """Database and collection names of the server of the shared client, listed at most every :param ttl: seconds
+
+    Resolving a collection string is then a lookup in memory, and the resolved collections are reused.
+    A string of a known database that does not resolve lists the collections of that database again, once until
+    the next refresh, so that collections created since the last refresh resolve as well. Databases created since
+    the last refresh only resolve after the next one, strings such as `Lv.5` never cost a round trip.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._namespaces: dict[str, frozenset[str]] = {}
+        self._collections: dict[str, mongo_collection] = {}
+        self._misses: set[str] = set()
+        self._refreshed_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.ttl
+
+    def invalidate(self) -> None:
+        self._refreshed_at = None
+
+    def refresh(self) -> None:
+        with self._lock:
+            if self.is_stale is False:  # refreshed by another thread while waiting for the lock
+                return
+            mongo_client = database.get_mongodb_client()
+            self._namespaces = {
+                db: frozenset(mongo_client[db].list_collection_names()) for db in mongo_client.list_database_names()
+            }
+            self._collections = {}
+            self._misses = set()
+            self._refreshed_at = time.monotonic()
+
+    def _list(self, db: str) -> None:
+        """lists the collections of the known database :param db: again"""
+        collections = frozenset(database.get_mongodb_client()[db].list_collection_names())
+        with self._lock:  # replaced rather than updated, other threads may be reading it
+            self._namespaces = self._namespaces | {db: collections}
+
+    def get(self, collection_string: str) -> mongo_collection:
+        if self.is_stale is True:
+            self.refresh()
+        elif (collection := self._collections.get(collection_string)) is not None:
+            return collection
+        db, collection = split_collection_full_name(collection_string)
+        if (collections := self._namespaces.get(db)) is None:
+            raise DatabaseNotFound(db)
+        if collection not in collections and collection_string not in self._misses:
+            self._misses.add(collection_string)
+            self._list(db)
+            collections = self._namespaces[db]
+        if collection not in collections:
+            raise CollectionNotFound(collection)
+        return self._collections.setdefault(collection_string, database.get_mongodb_client()[db][collection])
+
+
+namespace_catalog = NamespaceCatalog()
+
+
 def collection_string_to_obj(collection_string: str) -> mongo_collection:
-    mongo_client = database.get_mongodb_client()
-    db, collection = split_collection_full_name(collection_string)
-    if db not in mongo_client.list_database_names():
-        raise DatabaseNotFound(db)
-    if collection not in mongo_client[db].list_collection_names():
-        raise CollectionNotFound(collection)
-    return database.get_mongodb_client()[db][collection]
+    return namespace_catalog.get(collection_string)
 
 
 class CollectionCodec(TypeCodec):
@@ -51,9 +112,11 @@ class CollectionCodec(TypeCodec):
     def transform_bson(self, value: str) -> str | mongo_collection:
         """Function that transforms a vanilla BSON type value into our
         custom type."""
+        if '.' not in value:  # cannot be a collection string
+            return value
         try:
             return collection_string_to_obj(value)
-        except (DatabaseNotFound, CollectionNotFound, ValueError):
+        except (DatabaseNotFound, CollectionNotFound, ValueError, PyMongoError):
             return value
 
 
@@ -0,0 +1,121 @@
+"""Content-addressed storage of the documents carried by stored commands"""
+import hashlib
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional, Iterable
+
+import bson
+from pymongo import UpdateOne
+
+from database.types import mongo_collection
+
+
+def payload_hash(encoded: bytes) -> str:
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PayloadStore:
+    """Stores every document once, zlib-compressed and keyed by the sha256 of its BSON
+
+    A command stored through :meth:`externalize` keeps the hashes of its documents under `payload` instead of its
+    `data`, so that a document written by several commands, e.g. an item that did not change between two scrapes,
+    is only stored once. Every document records when it was last stored, see :meth:`prune`.
+    """
+
+    def __init__(self, collection: mongo_collection, level: int = 6):
+        self.collection = collection
+        self.level = level
+
+    def put(self, documents: Iterable[dict]) -> list[str]:
+        """
+        Returns:
+            The hash of every document of :param documents:, in order
+        """
+        hashes, operations, stored_at = [], {}, datetime.utcnow()
+        for document in documents:
+            encoded = bson.encode(document)
+            hashes.append(digest := payload_hash(encoded))
+            operations.setdefault(digest, UpdateOne(
+                {'_id': digest},
+                {'$setOnInsert': {'data': zlib.compress(encoded, self.level)}, '$set': {'stored_at': stored_at}},
+                upsert=True
+            ))
+        if operations:
+            self.collection.bulk_write(list(operations.values()), ordered=False)
+        return hashes
+
+    def fetch(self, hashes: Iterable[str]) -> dict[str, dict]:
+        """the documents of :param hashes:, with a single query"""
+        return {
+            blob['_id']: bson.decode(zlib.decompress(blob['data']))
+            for blob in self.collection.find({'_id': {'$in': list(set(hashes))}}, {'data': True})
+        }
+
+    def get(self, hashes: list[str]) -> list[dict]:
+        """the documents of :param hashes:, in order"""
+        documents = self.fetch(hashes)
+        return [documents[digest] for digest in hashes]
+
+    def externalize(self, command: dict) -> dict:
+        """Replaces the `data` of :param command: by the hashes of its documents when it is a document or a list
+        of documents
+        """
+        match command.get('data'):
+            case dict() as document:
+                return {key: value for key, value in command.items() if key != 'data'} | {
+                    'payload': self.put([document])[0]
+                }
+            case [*documents] if all(isinstance(document, dict) for document in documents):
+                return {key: value for key, value in command.items() if key != 'data'} | {
+                    'payload': self.put(documents)
+                }
+        return command
+
+    def resolve(self, command: dict) -> dict:
+        """Inverse of :meth:`externalize`, commands stored with their `data` are returned as is"""
+        return self.resolve_many([command])[0]
+
+    def resolve_many(self, commands: list[dict]) -> list[dict]:
+        """:meth:`resolve` of every command of :param commands:, their documents are read with a single query"""
+        hashes = []
+        for command in commands:
+            if isinstance(payload := command.get('payload'), str):
+                hashes.append(payload)
+            elif payload is not None:
+                hashes += payload
+        documents = self.fetch(hashes) if hashes else {}
+
+        def resolved(command: dict) -> dict:
+            if (payload := command.get('payload')) is None:
+                return command
+            data = documents[payload] if isinstance(payload, str) else [documents[digest] for digest in payload]
+            return {key: value for key, value in command.items() if key != 'payload'} | {'data': data}
+
+        return [resolved(command) for command in commands]
+
+    def prune(self, mementos: mongo_collection, grace: timedelta = timedelta(hours=1)) -> int:
+        """Deletes the documents no longer referenced by the commands of :param mementos:
+
+        Documents are stored before the memento referencing them is inserted, so only those last stored more than
+        :param grace: ago are deleted: a prune must not outlast the grace period of a registration running
+        concurrently.
+
+        Returns:
+            The number of deleted documents
+        """
+        referenced = set(mementos.distinct('command.payload'))
+        unreferenced = [
+            blob['_id'] for blob in self.collection.find(
+                {'stored_at': {'$lt': datetime.utcnow() - grace}}, {'_id': True}
+            ) if blob['_id'] not in referenced
+        ]
+        if not unreferenced:
+            return 0
+        # a document stored again since it was listed is referenced by a memento being registered
+        return self.collection.delete_many({
+            '_id': {'$in': unreferenced}, 'stored_at': {'$lt': datetime.utcnow() - grace}
+        }).deleted_count
+
+    def size(self) -> Optional[int]:
+        """compressed size of the stored documents, in bytes"""
+        return self.collection.database.command('collStats', self.collection.name).get('size')
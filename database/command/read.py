@@ -1,9 +1,80 @@
+"""Crud Operations"""
+import logging
 from abc import abstractmethod, ABC
+from typing import Optional, Sequence
 
 from pymongo.command_cursor import CommandCursor
 
+from database.client import round_trip_counter
 from database.indexes import AggregationIndexes
-from database.models import QueryInformation
+from database.models import QueryInformation, AsyncQueryInformation
+from database.types import mongo_collection
+
+logger = logging.getLogger(__name__)
+
+
+def autocomplete_pipeline(to_search: str, index: AggregationIndexes, *, limit: int) -> list[dict]:
+    return [
+        {
+            '$search': {
+                'index': index.value,
+                'autocomplete': {
+                    'query': to_search,
+                    'path': 'name',
+                    'fuzzy': {
+                        'maxEdits': 2,
+                        'prefixLength': 1
+                    }
+                },
+                'highlight': {
+                    'path': 'name',
+                }
+            }
+        }, {
+            '$addFields': {
+                'highlights': {
+                    '$meta': 'searchHighlights'
+                }
+            }
+        }, {
+            '$sort': {
+                'highlights.score': -1
+            }
+        }, {
+            '$limit': limit
+        }
+    ]
+
+
+def text_search_pipeline(to_search: str, index: AggregationIndexes, *, limit: int) -> list[dict]:
+    return [
+        {
+            '$search': {
+                'index': index.value,
+                'text': {
+                    'query': to_search,
+                    'path': 'name',
+                    'fuzzy': {
+                        'maxEdits': 2,
+                        'prefixLength': 1
+                    }
+                }
+            }
+        }, {
+            '$addFields': {
+                'score': {
+                    '$meta': 'searchScore'
+                }
+            }
+
+        }, {
+            '$sort': {
+                'score': -1
+            }
+        }, {
+            '$limit': limit
+        }
+    ]
 
 
 class SearchStrategy(ABC):
@@ -16,66 +87,61 @@ class SearchStrategy(ABC):
 class AutoCompleteSearch(SearchStrategy):
 
     def query(self, query: QueryInformation, index: AggregationIndexes, *, limit: int = 100) -> CommandCursor:
-        return query.collection.aggregate([
-            {
-                '$search': {
-                    'index': index.value,
-                    'autocomplete': {
-                        'query': query.to_search,
-                        'path': 'name',
-                        'fuzzy': {
-                            'maxEdits': 2,
-                            'prefixLength': 1
-                        }
-                    },
-                    'highlight': {
-                        'path': 'name',
-                    }
-                }
-            }, {
-                '$addFields': {
-                    'highlights': {
-                        '$meta': 'searchHighlights'
-                    }
-                }
-            }, {
-                '$sort': {
-                    'highlights.score': -1
-                }
-            }, {
-                '$limit': limit
-            }
-        ])
+        return query.collection.aggregate(autocomplete_pipeline(query.to_search, index, limit=limit))
 
 
 class TextSearch(SearchStrategy):
 
     def query(self, query: QueryInformation, index: AggregationIndexes, *, limit: int = 100) -> CommandCursor:
-        return query.collection.aggregate([
-            {
-                '$search': {
-                    'index': index.value,
-                    'text': {
-                        'query': query.to_search,
-                        'path': 'name',
-                        'fuzzy': {
-                            'maxEdits': 2,
-                            'prefixLength': 1
-                        }
-                    }
-                }
-            }, {
-                '$addFields': {
-                    'score': {
-                        '$meta': 'searchScore'
-                    }
-                }
+        return query.collection.aggregate(text_search_pipeline(query.to_search, index, limit=limit))
 
-            }, {
-                '$sort': {
-                    'score': -1
-                }
-            }, {
-                '$limit': limit
-            }
-        ])
+
+class AsyncSearchStrategy(ABC):
+    """:class:`SearchStrategy` for motor collections, the round-trip is awaited instead of blocking the loop"""
+
+    @abstractmethod
+    async def query(self, query: AsyncQueryInformation, index: AggregationIndexes, *, limit: int = 100) -> list[dict]:
+        pass
+
+
+class AsyncAutoCompleteSearch(AsyncSearchStrategy):
+
+    async def query(self, query: AsyncQueryInformation, index: AggregationIndexes, *, limit: int = 100) -> list[dict]:
+        cursor = query.collection.aggregate(autocomplete_pipeline(query.to_search, index, limit=limit))
+        return await cursor.to_list(length=limit)
+
+
+class AsyncTextSearch(AsyncSearchStrategy):
+
+    async def query(self, query: AsyncQueryInformation, index: AggregationIndexes, *, limit: int = 100) -> list[dict]:
+        cursor = query.collection.aggregate(text_search_pipeline(query.to_search, index, limit=limit))
+        return await cursor.to_list(length=limit)
+
+
+class LeafLoader:
+    """Fetches every leaf of a composite with a single `$in` query instead of one `find_one` per leaf
+
+    The round trips of every load are counted by :data:`database.client.round_trip_counter` and logged, only the
+    commands of the registered client are counted.
+    """
+
+    def __init__(self, collection: mongo_collection):
+        self.collection = collection
+
+    def load(self, leaf_ids: Sequence) -> list[Optional[dict]]:
+        """
+        Returns:
+            The leaf documents in the same order as :param leaf_ids:, None for leaves that do not exist
+        """
+        if not leaf_ids:
+            return []
+        round_trips = round_trip_counter.count
+        # a batch as large as the request keeps the whole result inside the first reply
+        cursor = self.collection.find({'_id': {'$in': list(leaf_ids)}}, batch_size=len(leaf_ids))
+        documents = {document['_id']: document for document in cursor}
+        logger.debug('%s: loaded %d/%d leaves in %d round trip(s)', self.collection.full_name, len(documents),
+                     len(leaf_ids), round_trip_counter.count - round_trips)
+        if missing := [leaf_id for leaf_id in leaf_ids if leaf_id not in documents]:
+            logger.warning('%s: %d/%d leaves do not exist: %s',
+                           self.collection.full_name, len(missing), len(leaf_ids), missing)
+        return [documents.get(leaf_id) for leaf_id in leaf_ids]
@@ -1,20 +1,31 @@
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Type, Optional, Generator, TypeVar, Generic, TypeAlias
+from itertools import islice
+from typing import Type, Optional, Generator, TypeVar, Generic, TypeAlias, NamedTuple, Iterable, ClassVar
 
-from bson import ObjectId
+from bson import ObjectId, CodecOptions
 from pydantic import BaseModel as PydanticBaseModel, Extra
 from pydantic.generics import GenericModel as PydanticGenericModel
 from pymongo import (
+    ASCENDING,
     InsertOne as MongoInsertOne,
     DeleteOne as MongoDeleteOne,
     DeleteMany as MongoDeleteMany,
     UpdateOne as MongoUpdateOne,
     UpdateMany as MongoUpdateMany
 )
+from pymongo.client_session import ClientSession
+from pymongo.topology_description import TOPOLOGY_TYPE
 
+from Utils.dataclasses.abc import WikiBaseModel
 from database import mongo_collection
+from database.codec import split_collection_full_name
+from database.command.payloads import PayloadStore
 from database.exceptions import CommandNotFound
 
+logger = logging.getLogger(__name__)
+
 DataD = TypeVar('DataD')
 PymongoOperationType: TypeAlias = MongoInsertOne | MongoDeleteOne | MongoDeleteMany | MongoUpdateOne | MongoUpdateMany
 
@@ -24,6 +35,13 @@ class DatabaseCommand(PydanticGenericModel, Generic[DataD], ABC):
     collection: mongo_collection
     data: DataD
 
+    registry: ClassVar[dict[str, Type['DatabaseCommand']]] = {}  # command name to command class
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '[' not in cls.__name__:  # not a parametrization such as `DatabaseCommand[dict]`
+            DatabaseCommand.registry.setdefault(cls.__name__, cls)
+
     def __init__(self, *, collection: mongo_collection, data: DataD, **_):
         super().__init__(name=self.__class__.__name__, collection=collection, data=data)
 
@@ -34,12 +52,19 @@ class DatabaseCommand(PydanticGenericModel, Generic[DataD], ABC):
     def execute(self):
         pass
 
+    @classmethod
+    def operations_of(cls, data) -> Optional[list[PymongoOperationType]]:
+        """The write operations of the stored :param data: of a command, so that it can be replayed in a bulk write
+        without being validated again, None if the command has to be executed on its own
+        """
+        return
+
     @classmethod
     def get_subclass(cls, command: str) -> Type['DatabaseCommand']:
-        for command_cls in cls.__subclasses__():
-            if command == command_cls.__name__:
-                return command_cls
-        raise CommandNotFound()
+        try:
+            return cls.registry[command]
+        except KeyError:
+            raise CommandNotFound() from None
 
 
 class InsertOne(DatabaseCommand[dict]):
@@ -47,12 +72,20 @@ class InsertOne(DatabaseCommand[dict]):
     def execute(self):
         self.collection.insert_one(self.data)
 
+    @classmethod
+    def operations_of(cls, data: dict) -> list[PymongoOperationType]:
+        return [MongoInsertOne(data)]
+
 
 class InsertMany(DatabaseCommand[list[dict]]):
 
     def execute(self):
         self.collection.insert_many(self.data)
 
+    @classmethod
+    def operations_of(cls, data: list[dict]) -> list[PymongoOperationType]:
+        return [MongoInsertOne(document) for document in data]
+
 
 class BulkWrite(DatabaseCommand[list[PymongoOperationType]]):
 
@@ -60,109 +93,319 @@ class BulkWrite(DatabaseCommand[list[PymongoOperationType]]):
         self.collection.bulk_write(self.data)
 
 
+class BatchTiming(NamedTuple):
+    size: int
+    upserted: int
+    modified: int
+    seconds: float
+
+
+class BulkUpsertWriter:
+    """Writes leaf models as unordered upserts keyed on their coryn id
+
+    Every document is written with `UpdateOne({'_id': id}, {'$set': ...}, upsert=True)`, so repeating a
+    scrape updates the existing documents instead of duplicating them.
+    """
+
+    def __init__(self, collection: mongo_collection, batch_size: int = 250):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.timings: list[BatchTiming] = []
+        self.skipped = 0
+
+    @staticmethod
+    def to_operation(document: dict) -> MongoUpdateOne:
+        document = dict(document)
+        return MongoUpdateOne({'_id': document.pop('_id')}, {'$set': document}, upsert=True)
+
+    @staticmethod
+    def is_writable(document: dict) -> bool:
+        return isinstance(document.get('_id'), int)  # False when the coryn id could not be parsed
+
+    def write_batch(self, documents: list[dict]) -> Optional[BatchTiming]:
+        operations = []
+        for document in documents:
+            if self.is_writable(document) is False:
+                self.skipped += 1
+                logger.warning('%s: skipped a document without a coryn id: %s',
+                               self.collection.full_name, document.get('name'))
+                continue
+            operations.append(self.to_operation(document))
+        if not operations:
+            return
+
+        start = time.perf_counter()
+        result = self.collection.bulk_write(operations, ordered=False)
+        timing = BatchTiming(len(operations), result.upserted_count, result.modified_count,
+                             time.perf_counter() - start)
+        self.timings.append(timing)
+        logger.debug('%s: upserted %d, modified %d of %d documents in %.3fs',
+                     self.collection.full_name, timing.upserted, timing.modified, timing.size, timing.seconds)
+        return timing
+
+    def write(self, models: Iterable[WikiBaseModel]) -> list[BatchTiming]:
+        """Writes :param models: in batches of :attr:`batch_size`
+
+        Returns:
+            The timing of every batch that was written
+        """
+        documents = (model.dict(by_alias=True) for model in models)
+        timings = []
+        while batch := list(islice(documents, self.batch_size)):
+            if (timing := self.write_batch(batch)) is not None:
+                timings.append(timing)
+        return timings
+
+
 class CommandMemento(PydanticBaseModel):
     next: Optional[ObjectId] = None
     command: DatabaseCommand
-    current: bool
+    position: int = 0  # 1 for the first registered command
 
     class Config:
         extra = Extra.ignore
         arbitrary_types_allowed = True
 
 
+class ReplayReport(NamedTuple):
+    commands: int
+    documents: int  # written through bulk writes
+    bulk_writes: int
+    seconds: float
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+
+class CommandReplay:
+    """Executes the commands stored in :param mementos: in the order they were registered
+
+    The mementos are streamed by position, which follows their `next` chain, and read without the collection
+    codec so that only the command is decoded, their documents are read from :param payloads: if they were stored
+    there. The operations of consecutive commands on the same collection are merged into ordered bulk writes of
+    at most :param batch_size: operations, so that a replay stops at the first failing write as the commands it
+    merges would have.
+    """
+
+    def __init__(
+            self,
+            mementos: mongo_collection,
+            payloads: Optional[PayloadStore] = None,
+            batch_size: int = 1000,
+            cursor_batch_size: int = 100
+    ):
+        self.mementos = mementos.with_options(codec_options=CodecOptions())
+        self.payloads = payloads
+        self.batch_size = batch_size
+        self.cursor_batch_size = cursor_batch_size
+
+    def get_collection(self, full_name: str) -> mongo_collection:
+        db, collection = split_collection_full_name(full_name)
+        return self.mementos.database.client[db][collection]
+
+    def commands(self, head: int) -> Generator[dict, None, None]:
+        """the stored commands up to the memento at position :param head:"""
+        cursor = self.mementos.find(
+            {'position': {'$gte': 1, '$lte': head}}, {'command': True},
+            sort=[('position', ASCENDING)], batch_size=self.cursor_batch_size
+        )
+        commands = (memento['command'] for memento in cursor)
+        if self.payloads is None:
+            yield from commands
+            return
+        while batch := list(islice(commands, self.cursor_batch_size)):  # one payload query per cursor batch
+            yield from self.payloads.resolve_many(batch)
+
+    def write(self, full_name: Optional[str], operations: list[PymongoOperationType]) -> int:
+        """
+        Returns:
+            The number of bulk writes made
+        """
+        if not operations:
+            return 0
+        self.get_collection(full_name).bulk_write(operations)
+        return 1
+
+    def replay(self, head: int) -> ReplayReport:
+        started = time.perf_counter()
+        commands = documents = bulk_writes = 0
+        full_name, operations = None, []
+        for command in self.commands(head):
+            commands += 1
+            command_cls = DatabaseCommand.get_subclass(command['name'])
+            if (command_operations := command_cls.operations_of(command['data'])) is None:
+                bulk_writes += self.write(full_name, operations)
+                full_name, operations = None, []
+                command_cls.parse_obj(command | {'collection': self.get_collection(command['collection'])}).execute()
+                continue
+            if command['collection'] != full_name:
+                bulk_writes += self.write(full_name, operations)
+                full_name, operations = command['collection'], []
+            operations += command_operations
+            documents += len(command_operations)
+            if len(operations) >= self.batch_size:
+                bulk_writes += self.write(full_name, operations)
+                operations = []
+        bulk_writes += self.write(full_name, operations)
+        return ReplayReport(commands, documents, bulk_writes, time.perf_counter() - started)
+
+
+CONTROL_ID = 'control'
+
+
 class DatabaseOperations:  # controller
 
-    def __init__(self, collection: mongo_collection):
+    def __init__(self, collection: mongo_collection, store_payloads: bool = True):
         """The Command Controller as dictated by the Command Design Pattern
 
+        The mementos form a single list ordered by their `position`. The position of the current memento is the
+        `head` of the control document `{'_id': 'control'}` stored alongside them, 0 while there are none.
+        A command is registered in one transaction, so that the head never points at a missing memento and
+        concurrent registrations are serialized by their write conflict on the control document: the head is
+        moved, then one ordered bulk write drops the undone mementos, inserts the new memento and links its parent
+        to it. Transactions require a replica set, as the Atlas deployment the bot uses, on a standalone mongod the
+        same writes are made without one and concurrent registrations must be avoided.
+
         Args:
             collection (mongo_collection): The Collection to use to store the mementos
+            store_payloads (bool): Whether the documents of the commands are stored once in the
+                `<collection>.payloads` :class:`PayloadStore` instead of inside of every memento
         """
         self.mementos = collection
+        self.payloads: Optional[PayloadStore] = None
+        if store_payloads is True:
+            self.payloads = PayloadStore(collection.database.get_collection(f'{collection.name}.payloads'))
+        self._indexed = False
+
+    def ensure_indexes(self) -> None:
+        if self._indexed is True:
+            return
+        self.migrate_legacy_mementos()
+        self.mementos.create_index(
+            [('position', ASCENDING)], unique=True, partialFilterExpression={'position': {'$exists': True}}
+        )
+        # created outside of the registering transactions, concurrent upserts of it would not be retried
+        self.mementos.update_one({'_id': CONTROL_ID}, {'$setOnInsert': {'head': 0}}, upsert=True)
+        self._indexed = True
+
+    def migrate_legacy_mementos(self) -> None:
+        """Positions the mementos written before the control document, when the current one was flagged `current`
+
+        The mementos that cannot be reached from the first one are undone branches that were never deleted.
+        """
+        legacy = {
+            document['_id']: document for document in self.mementos.find(
+                {'_id': {'$ne': CONTROL_ID}, 'position': {'$exists': False}}, {'next': 1, 'current': 1}
+            )
+        }
+        if not legacy:
+            return
+        linked = {document.get('next') for document in legacy.values()}
+        memento_id = min((document_id for document_id in legacy if document_id not in linked), default=None)
+        operations, head, position = [], 0, 0
+        while (document := legacy.pop(memento_id, None)) is not None:
+            position += 1
+            operations.append(MongoUpdateOne(
+                {'_id': memento_id}, {'$set': {'position': position}, '$unset': {'current': ''}}
+            ))
+            if document.get('current') is True:
+                head = position
+            memento_id = document.get('next')
+        operations += [MongoDeleteOne({'_id': document_id}) for document_id in legacy]
+        operations.append(MongoUpdateOne({'_id': CONTROL_ID}, {'$set': {'head': head or position}}, upsert=True))
+        self.mementos.bulk_write(operations)
+        logger.info('%s: positioned %d legacy mementos, deleted %d unreachable ones',
+                    self.mementos.full_name, position, len(legacy))
+
+    @property
+    def head(self) -> int:
+        """position of the current memento"""
+        if control := self.mementos.find_one({'_id': CONTROL_ID}, {'head': 1}):
+            return control['head']
+        return 0
+
+    def get_at(self, position: int) -> Optional[ObjectId]:
+        if document := self.mementos.find_one({'position': position}, {'_id': 1}):
+            return document['_id']
 
     @property
     def current(self) -> Optional[ObjectId]:
-        try:
-            return next(self.mementos.find({'current': True}, {'_id': 1}).sort('_id', -1).limit(1))['_id']
-        except StopIteration:
-            return
+        return self.get_at(self.head)
 
     def get_next_of(self, document_id: ObjectId) -> Optional[ObjectId]:
         if next_document := self.mementos.find_one({'_id': document_id}, {'next': 1}):
-            return next_document['next']
+            return next_document.get('next')
 
     def get_parent_of(self, document_id: ObjectId) -> Optional[ObjectId]:
-        if parent_document := self.mementos.find_one({'next': document_id}, {'_id': 1}):
-            return parent_document['_id']
+        if document := self.mementos.find_one({'_id': document_id}, {'position': 1}):
+            return self.get_at(document['position'] - 1)
 
     def register(self, command: DatabaseCommand):
-        self._append_memento(CommandMemento(command=command, current=True))
+        self._append_memento(command)
 
-    def _fetch_mementos(self) -> Generator[CommandMemento, None, None]:
-        every_memento = self.mementos.find({})
+    def fetch_mementos(self) -> Generator[CommandMemento, None, None]:
+        """the mementos up to the current one in order, with their commands validated again"""
+        every_memento = self.mementos.find({'position': {'$gte': 1, '$lte': self.head}}).sort('position', ASCENDING)
         for memento in every_memento:
             command = memento.pop('command')
+            if self.payloads is not None:
+                command = self.payloads.resolve(command)
             command_cls = DatabaseCommand.get_subclass(command['name']).parse_obj(command)
             yield CommandMemento(command=command_cls, **memento)
 
-    def _delete_mementos_from(self, object_id: ObjectId):
-        # recursively delete mementos starting from :param object_id: document
-        results = self.mementos.aggregate(
-            [
-                {
-                    '$match': {
-                        '_id': object_id
-                    }
-                },
-                {
-                    '$graphLookup': {
-                        'from': 'database',
-                        'startWith': object_id,
-                        'connectFromField': 'next',
-                        'connectToField': '_id',
-                        'as': 'toDelete'
-                    }
-                },
-                {
-                    '$unwind': '$toDelete'
-                },
-                {
-                    '$project': {
-                        '_id': '$toDelete._id'
-                    }
-                }
+    def _append_memento(self, command: DatabaseCommand):
+        self.ensure_indexes()
+        document = CommandMemento(command=command).dict(by_alias=True)
+        if self.payloads is not None:  # stored before the memento that references them
+            document['command'] = self.payloads.externalize(document['command'])
+        memento_id = ObjectId()
+
+        def append(session: Optional[ClientSession]) -> None:  # retried as a whole on a transient error
+            control = self.mementos.find_one_and_update(  # returns the control document before the update
+                {'_id': CONTROL_ID}, {'$inc': {'head': 1}}, {'head': 1}, session=session
+            )
+            parent_position = control['head']
+            operations = [
+                MongoDeleteMany({'position': {'$gt': parent_position}}),  # the undone mementos
+                MongoInsertOne({'_id': memento_id} | document | {'position': parent_position + 1})
             ]
-        )
-        if len(document_ids := [document['_id'] for document in results]) != 0:
-            self.mementos.bulk_write([MongoDeleteOne({'_id': _}) for _ in document_ids])
+            if parent_position:
+                operations.append(MongoUpdateOne({'position': parent_position}, {'$set': {'next': memento_id}}))
+            self.mementos.bulk_write(operations, session=session)
 
-    def _append_memento(self, memento: CommandMemento):
-        old_current = self.current
-        self.mementos.insert_one(memento.dict(by_alias=True))
-        if old_current:
-            self.mementos.update_one({'_id': old_current}, {'$set': {'next': self.current, 'current': False}})
-            if object_id := self.get_next_of(old_current):
-                self._delete_mementos_from(object_id)
+        mongo_client = self.mementos.database.client
+        if mongo_client.topology_description.topology_type == TOPOLOGY_TYPE.Single:  # no transactions
+            append(None)
+            return
+        with mongo_client.start_session() as session:
+            session.with_transaction(append)
 
     def undo(self):
-        current = self.current
-        if document_id_of_parent := self.get_parent_of(current):
-            self.mementos.bulk_write([
-                MongoUpdateOne({'_id': current}, {'$set': {'current': False}}),
-                MongoUpdateOne({'_id': document_id_of_parent}, {'$set': {'current': True}})
-            ])
+        # the first memento is never undone
+        self.mementos.update_one({'_id': CONTROL_ID, 'head': {'$gt': 1}}, {'$inc': {'head': -1}})
 
     def redo(self):
-        current = self.current
-        if document_id_of_next := self.get_next_of(current):
-            self.mementos.bulk_write([
-                MongoUpdateOne({'_id': current}, {'$set': {'current': False}}),
-                MongoUpdateOne({'_id': document_id_of_next}, {'$set': {'current': True}})
-            ])
+        head = self.head
+        if self.get_at(head + 1) is not None:
+            self.mementos.update_one({'_id': CONTROL_ID, 'head': head}, {'$set': {'head': head + 1}})
 
     def clear_mementos(self):
-        self.mementos.delete_many({})
-
-    def execute_commands(self):
-        for memento in self._fetch_mementos():
-            memento.command.execute()
+        self.mementos.bulk_write([
+            MongoDeleteMany({'_id': {'$ne': CONTROL_ID}}),
+            MongoUpdateOne({'_id': CONTROL_ID}, {'$set': {'head': 0}}, upsert=True)
+        ])
+        if self.payloads is not None:
+            self.payloads.collection.delete_many({})
+
+    def prune_payloads(self) -> int:
+        """Deletes the payloads of the mementos that were dropped, see :meth:`PayloadStore.prune`"""
+        return 0 if self.payloads is None else self.payloads.prune(self.mementos)
+
+    def execute_commands(self) -> ReplayReport:
+        """Replays the commands up to the current one, see :class:`CommandReplay`"""
+        report = CommandReplay(self.mementos, self.payloads).replay(self.head)
+        logger.info('%s: replayed %d commands, %d documents in %d bulk writes in %.2fs (%.0f documents/s)',
+                    self.mementos.full_name, report.commands, report.documents, report.bulk_writes, report.seconds,
+                    report.documents_per_second)
+        return report
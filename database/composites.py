@@ -0,0 +1,188 @@
+"""Builds the composite collections searched by `/item` and `/monster` out of their leaf collections
+
+A composite groups the leaves sharing a normalized name (and a spawn location for monsters), it is written with a
+server-side `$group` and `$merge` so the leaves never leave the database. Every composite keeps the `key` it was
+grouped on, so that a rebuild can be limited to the composites of the leaves that changed.
+"""
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterable, Optional, NamedTuple
+
+from pymongo import ASCENDING
+
+from database.types import mongo_collection
+
+logger = logging.getLogger(__name__)
+
+
+def normalized_name_expression(field: str = '$name') -> dict:
+    """aggregation expression of the lower cased and trimmed :param field:"""
+    return {'$toLower': {'$trim': {'input': field}}}
+
+
+class CompositeBuild(NamedTuple):
+    keys: Optional[int]  # keys that were rebuilt, None for a full rebuild
+    merged: int
+    removed: int
+    seconds: float
+
+
+class CompositeBuilder(ABC):
+    """Groups the documents of :param leaf_collection: into :param composite_collection:
+
+    :meth:`build` rebuilds every composite, :meth:`build_for` only those holding or that should hold
+    the given leaves and :meth:`build_since` those of the leaves written by an incremental scrape.
+    """
+
+    def __init__(self, leaf_collection: mongo_collection, composite_collection: mongo_collection):
+        self.leaf_collection = leaf_collection
+        self.composite_collection = composite_collection
+
+    @abstractmethod
+    def key_expression(self) -> dict:
+        """aggregation expression of the key a leaf is grouped on"""
+
+    @abstractmethod
+    def leaf_fields(self) -> dict:
+        """fields of the composite leaf, computed from the leaf document"""
+
+    @abstractmethod
+    def composite_fields(self) -> dict:
+        """accumulators of the composite fields other than its key and leaves"""
+
+    def leaf_sort(self) -> dict:
+        """order of the leaves inside of a composite"""
+        return {'_id': ASCENDING}
+
+    def ensure_indexes(self) -> None:
+        # $merge matches on `key`, which requires a unique index on it
+        self.composite_collection.create_index([('key', ASCENDING)], unique=True)
+        self.composite_collection.create_index([('leaves._id', ASCENDING)])
+
+    def pipeline(self, keys: Optional[list[str]], built_at: datetime) -> list[dict]:
+        stages = [{'$addFields': {'key': self.key_expression()}}]
+        if keys is not None:
+            stages.append({'$match': {'key': {'$in': keys}}})
+        stages += [
+            {'$sort': self.leaf_sort()},
+            {
+                '$group': {
+                    '_id': '$key',
+                    'leaves': {'$push': {'_id': '$_id'} | self.leaf_fields()}
+                } | self.composite_fields()
+            },
+            {'$project': {'_id': False, 'key': '$_id', 'leaves': True} | dict.fromkeys(self.composite_fields(), True)},
+            {'$addFields': {'built_at': built_at}},
+            {
+                '$merge': {
+                    'into': self.composite_collection.name,
+                    'on': 'key',
+                    'whenMatched': 'replace',
+                    'whenNotMatched': 'insert'
+                }
+            }
+        ]
+        if self.composite_collection.database.name != self.leaf_collection.database.name:
+            stages[-1]['$merge']['into'] = {
+                'db': self.composite_collection.database.name, 'coll': self.composite_collection.name
+            }
+        return stages
+
+    def keys_of(self, leaf_ids: list) -> list[str]:
+        """Keys of the composites :param leaf_ids: belong to now and belonged to at the previous build
+
+        A renamed leaf moves to another composite, both have to be rebuilt.
+        """
+        keys = {
+            document['key'] for document in self.leaf_collection.aggregate([
+                {'$match': {'_id': {'$in': leaf_ids}}},
+                {'$project': {'_id': False, 'key': self.key_expression()}}
+            ])
+        }
+        keys.update(self.composite_collection.distinct('key', {'leaves._id': {'$in': leaf_ids}}))
+        return sorted(keys)
+
+    def _build(self, keys: Optional[list[str]]) -> CompositeBuild:
+        started = time.perf_counter()
+        built_at = datetime.utcnow()
+        if self.composite_collection.find_one({'key': {'$exists': False}}, {'_id': True}) is not None:
+            # composites written before they were keyed, e.g. by generate_items_composite.sql
+            self.composite_collection.delete_many({'key': {'$exists': False}})
+            keys = None
+        self.ensure_indexes()
+        self.leaf_collection.aggregate(self.pipeline(keys, built_at), allowDiskUse=True)
+        stale = {'built_at': {'$ne': built_at}}  # composites left without any leaf
+        if keys is not None:
+            stale['key'] = {'$in': keys}
+        removed = self.composite_collection.delete_many(stale).deleted_count
+        merged = self.composite_collection.count_documents({'built_at': built_at})
+        build = CompositeBuild(None if keys is None else len(keys), merged, removed, time.perf_counter() - started)
+        logger.info(
+            f'Built {build.merged} composites of {self.composite_collection.full_name}, removed {build.removed} '
+            f'in {build.seconds:.2f}s'
+        )
+        return build
+
+    def build(self) -> CompositeBuild:
+        return self._build(None)
+
+    def build_for(self, leaf_ids: Iterable) -> CompositeBuild:
+        if not (leaf_ids := list(leaf_ids)):
+            return CompositeBuild(0, 0, 0, 0.0)
+        return self._build(self.keys_of(leaf_ids))
+
+    def build_since(self, entities_collection: mongo_collection, since: datetime) -> CompositeBuild:
+        """Rebuilds the composites of the leaves recorded as written in :param entities_collection: after
+        :param since:, see :class:`scraper.spiders.incremental.EntityHashStore`
+        """
+        return self.build_for(entities_collection.distinct('entity_id', {
+            'collection': self.leaf_collection.full_name, 'scraped_at': {'$gte': since}
+        }))
+
+
+class ItemCompositeBuilder(CompositeBuilder):
+    """Builds :class:`Utils.dataclasses.item.ItemComposite`, as `console_commands/generate_items_composite.sql`"""
+
+    def key_expression(self) -> dict:
+        return normalized_name_expression()
+
+    def leaf_fields(self) -> dict:
+        # display string of the first place the item is obtained from
+        source = {'$ifNull': [{'$arrayElemAt': [{'$arrayElemAt': ['$location.monster', 0]}, 1]}, '']}
+        return {
+            'difference': {
+                '$switch': {
+                    'branches': [
+                        {'case': {'$regexMatch': {'input': source, 'regex': difference}}, 'then': difference}
+                        for difference in ('NPC', 'Player', 'Orb Shop')
+                    ],
+                    'default': 'Monster'
+                }
+            },
+            'has_dye': {
+                '$anyElementTrue': [{'$map': {'input': {'$ifNull': ['$location', []]}, 'in': '$$this.dye'}}]
+            }
+        }
+
+    def composite_fields(self) -> dict:
+        return {'name': {'$first': '$name'}}
+
+
+class MonsterCompositeBuilder(CompositeBuilder):
+    """Builds :class:`Utils.dataclasses.monster.MonsterComposite`, one composite per monster and spawn location"""
+
+    def key_expression(self) -> dict:
+        # the location id is missing for the maps coryn does not link, the display string is used instead
+        location = {'$toString': {'$ifNull': [{'$arrayElemAt': ['$location', 0]}, {'$arrayElemAt': ['$location', 1]}]}}
+        return {'$concat': [normalized_name_expression(), '@', location]}
+
+    def leaf_fields(self) -> dict:
+        return {'level': '$level', 'difficulty': '$difficulty'}
+
+    def composite_fields(self) -> dict:
+        return {'name': {'$first': '$name'}, 'location': {'$first': '$location'}}
+
+    def leaf_sort(self) -> dict:
+        return {'level': ASCENDING, '_id': ASCENDING}
@@ -1,10 +1,11 @@
 from bson import CodecOptions
 from bson.codec_options import TypeRegistry
+from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel as PydanticBaseModel
 from pymongo import MongoClient
 
 from database.codec import CollectionCodec, DiscordEmbedCodec
-from database.types import mongo_database, mongo_collection
+from database.types import mongo_database, mongo_collection, motor_collection
 
 
 class WhiskeyDatabase:
@@ -24,6 +25,12 @@ class WhiskeyDatabase:
 
         self.pages: mongo_database = client.pages
 
+        # levelling database
+        self.levelling: mongo_database = client.levelling
+
+        # scrapes database, state of the incremental scrapes
+        self.scrapes: mongo_database = client.scrapes
+
     @property
     def discord_guilds(self) -> mongo_collection:
         return self.discord.guilds
@@ -48,6 +55,18 @@ class WhiskeyDatabase:
     def monsters_leaf(self) -> mongo_collection:
         return self.monsters.monsters.leaf
 
+    @property
+    def levelling_tables(self) -> mongo_collection:
+        return self.levelling.levelling.tables
+
+    @property
+    def scrape_pages(self) -> mongo_collection:
+        return self.scrapes.pages
+
+    @property
+    def scrape_entities(self) -> mongo_collection:
+        return self.scrapes.entities
+
     @property
     def pages_help(self) -> mongo_collection:
         return self.pages.get_collection(
@@ -61,9 +80,24 @@ class WhiskeyDatabase:
         )
 
 
+class AsyncWhiskeyDatabase(WhiskeyDatabase):
+    """:class:`WhiskeyDatabase` over a motor client, every collection returns awaitables"""
+
+    def __init__(self, client: AsyncIOMotorClient):
+        super().__init__(client)
+
+
 class QueryInformation(PydanticBaseModel):
     collection: mongo_collection
     to_search: str
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class AsyncQueryInformation(PydanticBaseModel):
+    collection: motor_collection
+    to_search: str
+
+    class Config:
+        arbitrary_types_allowed = True
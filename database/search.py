@@ -0,0 +1,204 @@
+"""In-process name search over the composite collections"""
+import asyncio
+import bisect
+import heapq
+from collections import Counter, defaultdict
+from typing import Optional, Iterable
+
+from pymongo.errors import PyMongoError
+
+from Utils.generics.strings import Grams, edit_distance
+from database.client import client_registry
+from database.command.read import SearchStrategy, AsyncSearchStrategy, AsyncTextSearch
+from database.indexes import AggregationIndexes
+from database.models import QueryInformation, AsyncQueryInformation, AsyncWhiskeyDatabase
+from database.types import motor_collection
+
+
+def normalize_name(name: str) -> str:
+    return ' '.join(name.lower().split())
+
+
+def name_trigrams(name: str) -> set[str]:
+    # the padding lets names and queries shorter than three characters produce grams
+    return set(Grams.trigram(f'  {name} '))
+
+
+class NameIndex:
+    """Trigram inverted index over the `name` field of a collection's documents
+
+    Candidates are the documents sharing the most trigrams with the query, they are then ranked by
+    their trigram similarity and edit distance to the query.
+    The distinct names are also kept sorted so that prefixes can be completed with a binary search.
+    """
+
+    def __init__(self, candidate_limit: int = 200, rerank_limit: int = 25):
+        self.candidate_limit = candidate_limit
+        self.rerank_limit = rerank_limit
+        self._documents: dict = {}
+        self._names: dict = {}
+        self._grams: defaultdict[str, set] = defaultdict(set)
+        self._sorted_names: list[str] = []  # distinct normalized names
+        self._name_counts: Counter = Counter()
+        self._display_names: dict[str, str] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, document: dict) -> None:
+        document_id = document['_id']
+        if document_id in self._documents:
+            self.remove(document_id)
+        name = normalize_name(document['name'])
+        self._documents[document_id] = document
+        self._names[document_id] = name
+        for gram in name_trigrams(name):
+            self._grams[gram].add(document_id)
+        if self._name_counts[name] == 0:
+            bisect.insort(self._sorted_names, name)
+            self._display_names[name] = document['name']
+        self._name_counts[name] += 1
+
+    def remove(self, document_id) -> None:
+        if (name := self._names.pop(document_id, None)) is None:
+            return
+        del self._documents[document_id]
+        for gram in name_trigrams(name):
+            if (postings := self._grams.get(gram)) is not None:
+                postings.discard(document_id)
+                if not postings:
+                    del self._grams[gram]
+        self._name_counts[name] -= 1
+        if self._name_counts[name] == 0:
+            del self._name_counts[name]
+            del self._display_names[name]
+            del self._sorted_names[bisect.bisect_left(self._sorted_names, name)]
+
+    def build(self, documents: Iterable[dict]) -> None:
+        self._documents.clear()
+        self._names.clear()
+        self._grams.clear()
+        self._sorted_names.clear()
+        self._name_counts.clear()
+        self._display_names.clear()
+        for document in documents:
+            self.add(document)
+
+    def complete(self, prefix: str, *, limit: int = 25) -> list[str]:
+        """
+        Returns:
+            Up to :param limit: distinct names starting with :param prefix:, or fuzzy matches if none does
+        """
+        prefix = normalize_name(prefix)
+        names = []
+        for name in self._sorted_names[bisect.bisect_left(self._sorted_names, prefix):]:
+            if len(names) == limit or not name.startswith(prefix):
+                break
+            names.append(name)
+        if not names and prefix:  # typos: fall back to the trigram ranking
+            for document in self.search(prefix, limit=limit):
+                if len(names) == limit:
+                    break
+                if (name := normalize_name(document['name'])) not in names:
+                    names.append(name)
+        return [self._display_names[name] for name in names]
+
+    def similarity(self, query_grams: set[str], document_id, overlap: int) -> float:
+        return overlap / (len(query_grams) + len(name_trigrams(self._names[document_id])) - overlap)
+
+    def score(self, query: str, document_id, similarity: float) -> float:
+        name = self._names[document_id]
+        distance = min(edit_distance(query, name), edit_distance(query, name[:len(query)]))
+        return similarity + 1 - distance / max(len(query), 1)
+
+    def search(self, to_search: str, *, limit: int = 100) -> list[dict]:
+        """
+        Returns:
+            Copies of the best matching documents with their `score`, best match first
+        """
+        query = normalize_name(to_search)
+        query_grams = name_trigrams(query)
+        overlaps: Counter = Counter()
+        for gram in query_grams:
+            overlaps.update(self._grams.get(gram, ()))
+
+        # the edit distance is only computed for the candidates with the most similar trigrams
+        candidates = heapq.nlargest(
+            max(limit, self.rerank_limit),
+            (
+                (self.similarity(query_grams, document_id, overlap), document_id)
+                for document_id, overlap in overlaps.most_common(self.candidate_limit)
+            ),
+            key=lambda pair: pair[0]
+        )
+        ranked = sorted(
+            ((self.score(query, document_id, similarity), document_id) for similarity, document_id in candidates),
+            key=lambda pair: pair[0],
+            reverse=True
+        )
+        return [{**self._documents[document_id], 'score': score} for score, document_id in ranked[:limit]]
+
+    async def load(self, collection: motor_collection) -> None:
+        self.build([document async for document in collection.find({})])
+
+    def watch(self, collection: motor_collection) -> None:
+        """Applies the change stream of :param collection: to the index in the background, requires a replica set"""
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch(collection))
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    async def _watch(self, collection: motor_collection) -> None:
+        try:
+            async with collection.watch(full_document='updateLookup') as stream:
+                async for change in stream:
+                    document_id = change['documentKey']['_id']
+                    if change['operationType'] == 'delete':
+                        self.remove(document_id)
+                    elif (document := change.get('fullDocument')) is not None:
+                        self.add(document)
+        except PyMongoError as exc:  # change streams are unavailable on standalone servers
+            print(f'Name index change stream stopped: {exc}')
+
+
+name_indexes: dict[AggregationIndexes, NameIndex] = {
+    AggregationIndexes.ItemsCompositeString: NameIndex(),
+    AggregationIndexes.MonstersCompositeString: NameIndex()
+}
+
+
+def is_local_search_enabled() -> bool:
+    return bool(client_registry.config.get('local_search', False))
+
+
+async def load_name_indexes(whiskey_database: AsyncWhiskeyDatabase, *, watch: bool = False) -> None:
+    collections = {
+        AggregationIndexes.ItemsCompositeString: whiskey_database.items_composite,
+        AggregationIndexes.MonstersCompositeString: whiskey_database.monsters_composite
+    }
+    for index, collection in collections.items():
+        await name_indexes[index].load(collection)
+        if watch is True:
+            name_indexes[index].watch(collection)
+
+
+class LocalSearch(SearchStrategy):
+    """:class:`SearchStrategy` answered by :data:`name_indexes` instead of an Atlas Search index"""
+
+    def query(self, query: QueryInformation, index: AggregationIndexes, *, limit: int = 100) -> list[dict]:
+        return name_indexes[index].search(query.to_search, limit=limit)
+
+
+class AsyncLocalSearch(AsyncSearchStrategy):
+
+    async def query(self, query: AsyncQueryInformation, index: AggregationIndexes, *, limit: int = 100) -> list[dict]:
+        return name_indexes[index].search(query.to_search, limit=limit)
+
+
+def get_async_search_strategy() -> AsyncSearchStrategy:
+    """The configured search engine, :class:`AsyncLocalSearch` when `local_search` is set"""
+    return AsyncLocalSearch() if is_local_search_enabled() else AsyncTextSearch()
@@ -1,6 +1,9 @@
 from typing import TypeAlias
 
 import pymongo.database
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 mongo_collection: TypeAlias = pymongo.collection.Collection
 mongo_database: TypeAlias = pymongo.database.Database
+motor_collection: TypeAlias = AsyncIOMotorCollection
+motor_database: TypeAlias = AsyncIOMotorDatabase
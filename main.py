@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+import asyncio
 import os
 import re
 from typing import Iterable
@@ -7,9 +10,14 @@ from discord import Interaction
 from discord.app_commands import CommandTree, AppCommandError
 from discord.ext import commands
 
+from Utils.discord.colours import colour_table, default_image_urls
 from Utils.discord.error_handling.interaction_error import OnInteractionError
-from database import get_mongodb_client
-from database.models import WhiskeyDatabase
+from database import get_async_mongodb_client, close_mongodb_clients
+from database.cache import GuildPrefixCache, DEFAULT_PREFIX
+from database.client import client_registry, load_mongodb_config
+from database.models import AsyncWhiskeyDatabase
+from database.search import load_name_indexes, name_indexes
+from scraper.spiders.service import crawler_service
 
 
 async def load_cogs(bot: commands.Bot):  # Loads all the Cogs
@@ -56,28 +64,51 @@ class MyBot(commands.Bot):
         )
         if not hasattr(self, 'uptime'):
             self.uptime = discord.utils.utcnow()
+        self.prefix_cache = GuildPrefixCache()
 
     @staticmethod
-    def fetch_prefix(bot: commands.Bot, message: discord.Message):
-        def inner() -> str:
+    async def fetch_prefix(bot: MyBot, message: discord.Message):
+        async def inner() -> str:
             if message.guild is None:
-                return '$'  # default prefix
-            return str(
-                WhiskeyDatabase(get_mongodb_client()).discord_guilds.find_one({'_id': message.guild.id})['prefix']
-            )
-        return commands.when_mentioned_or(inner())(bot, message)
+                return DEFAULT_PREFIX
+            if (prefix := bot.prefix_cache.get(message.guild.id)) is None:  # guild was not loaded yet
+                prefix = await bot.prefix_cache.fetch(
+                    AsyncWhiskeyDatabase(get_async_mongodb_client()).discord_guilds, message.guild.id
+                )
+            return prefix
+        return commands.when_mentioned_or(await inner())(bot, message)
 
     async def copy_global_to(self, guilds: Iterable[int]):
         for guild in guilds:
             self.tree.copy_global_to(guild=discord.Object(guild))
 
     async def setup_hook(self) -> None:
+        client_registry.configure(load_mongodb_config())
+        crawler_service.start()
+        self.loop.create_task(asyncio.to_thread(colour_table.refresh, default_image_urls()))
         await load_cogs(self)
 
+    async def close(self) -> None:
+        self.prefix_cache.stop_watching()
+        for name_index in name_indexes.values():
+            name_index.stop_watching()
+        await super().close()
+        crawler_service.stop()
+        close_mongodb_clients()
+
     async def on_ready(self):
+        discord_guilds = AsyncWhiskeyDatabase(get_async_mongodb_client()).discord_guilds
+        await self.prefix_cache.load(discord_guilds)
+        if client_registry.config.get('watch_changes', False):
+            self.prefix_cache.watch(discord_guilds)
+        await load_name_indexes(  # used by autocomplete and, when enabled, local search
+            AsyncWhiskeyDatabase(get_async_mongodb_client()),
+            watch=client_registry.config.get('watch_changes', False)
+        )
         await self.copy_global_to(guild.id for guild in self.guilds)
         await self.tree.sync()
         print(f'Logged in as {self.user} (ID: {self.user.id})')
+        print(f'MongoDB clients: {client_registry.client_count}')
         print('------')
 
 
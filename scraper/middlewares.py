@@ -3,7 +3,12 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+from pathlib import Path
+
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+from scraper.spiders.response_store import ResponseStore
 
 # useful for handling different item types with a single interface
 
@@ -102,3 +107,32 @@ class ScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info('Spider opened: %s' % spider.name)
+
+
+class ResponseStoreMiddleware:
+    """Records every successful response into a :class:`ResponseStore` so that the crawl can be replayed
+
+    Settings:
+        RESPONSE_STORE_ENABLED: enables the middleware
+        RESPONSE_STORE_PATH: directory of the store, `data/responses` by default
+    """
+
+    def __init__(self, store: ResponseStore):
+        self.store = store
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if crawler.settings.getbool('RESPONSE_STORE_ENABLED') is False:
+            raise NotConfigured('RESPONSE_STORE_ENABLED is not set')
+        path = crawler.settings.get('RESPONSE_STORE_PATH')
+        s = cls(ResponseStore(Path(path)) if path else ResponseStore())
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def process_response(self, request, response, spider):
+        if response.status == 200:
+            self.store.save(response)
+        return response
+
+    def spider_closed(self, spider):
+        self.store.flush()
@@ -5,8 +5,177 @@
 
 
 # useful for handling different item types with a single interface
+import logging
+
+from scrapy.exceptions import NotConfigured
+from twisted.internet import threads
+from twisted.internet.defer import Deferred, DeferredList
+from twisted.python.failure import Failure
+
+from database import get_mongodb_client
+from database.codec import split_collection_full_name
+from database.command.write import BulkUpsertWriter
+from database.models import WhiskeyDatabase
+from scraper.spiders.incremental import EntityHashStore, document_hash
+
+logger = logging.getLogger(__name__)
+
+
+class MongoPipelineError(Exception):
+    def __init__(self, collection_name: str, failures: int):
+        super().__init__(f'{failures} batch writes to {collection_name} failed')
 
 
 class ScraperPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class MongoBatchPipeline:
+    """Upserts the scraped models to MongoDB in bounded batches while the crawl is still running
+
+    Settings:
+        MONGO_PIPELINE_COLLECTION: full name of the collection to write to, e.g. `items.items.leaf`
+        MONGO_PIPELINE_BATCH_SIZE: number of documents per bulk write
+        MONGO_PIPELINE_MAX_PENDING_WRITES: writes allowed in flight before the crawl waits for them
+
+    Written items are replaced by their `_id` so that nothing holds on to the scraped models.
+    A failed write is logged and recorded in :attr:`failures` and in the `mongo_pipeline/failed_writes` stat,
+    the first one closes the spider with the `mongo_write_failed` reason so that the crawl does not continue
+    against a database it cannot write to. The urls of the pages with a document that was not written are kept in
+    :attr:`failed_urls` and in the `mongo_pipeline/failed_urls` stat.
+    """
+
+    def __init__(self, collection_name: str, batch_size: int = 250, max_pending_writes: int = 2):
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.max_pending_writes = max_pending_writes
+        self.collection = None
+        self.spider = None
+        self.writer: BulkUpsertWriter | None = None
+        self.batch: list[tuple[str, dict]] = []  # url of the page and document
+        self.pending_writes: set[Deferred] = set()
+        self.failures: list[Failure] = []
+        self.failed_urls: set[str] = set()
+        self.written = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if (collection_name := settings.get('MONGO_PIPELINE_COLLECTION')) is None:
+            raise NotConfigured('MONGO_PIPELINE_COLLECTION is not set')
+        return cls(
+            collection_name=collection_name,
+            batch_size=settings.getint('MONGO_PIPELINE_BATCH_SIZE', 250),
+            max_pending_writes=settings.getint('MONGO_PIPELINE_MAX_PENDING_WRITES', 2)
+        )
+
+    def open_spider(self, spider):
+        self.spider = spider
+        db, collection = split_collection_full_name(self.collection_name)
+        self.collection = get_mongodb_client()[db][collection]
+        self.writer = BulkUpsertWriter(self.collection, self.batch_size)
+
+    def write(self, batch: list[tuple[str, dict]]) -> int:
+        """runs in the reactor's thread pool so that downloads continue during the write"""
+        self.writer.write_batch([document for _, document in batch])
+        return len(batch)
+
+    def flush(self) -> Deferred:
+        batch, self.batch = self.batch, []
+        deferred = threads.deferToThread(self.write, batch)
+        self.pending_writes.add(deferred)
+
+        def on_written(amount: int) -> int:
+            self.written += amount
+            return amount
+
+        def on_failed(failure: Failure) -> int:
+            self.failures.append(failure)
+            self.failed_urls.update(url for url, _ in batch)
+            logger.error(f'Failed to write {len(batch)} documents to {self.collection_name}',
+                         exc_info=(failure.type, failure.value, failure.getTracebackObject()))
+            crawler = self.spider.crawler
+            crawler.stats.inc_value('mongo_pipeline/failed_writes')
+            if len(self.failures) == 1:
+                crawler.engine.close_spider(self.spider, 'mongo_write_failed')
+            return 0
+
+        deferred.addCallbacks(on_written, on_failed)
+        deferred.addBoth(lambda result: (self.pending_writes.discard(deferred), result)[1])
+        return deferred
+
+    def should_write(self, document: dict) -> bool:
+        return True
+
+    def process_item(self, item, spider):
+        document = item['result'].dict(by_alias=True)
+        result = {'_id': document['_id'], 'url': item.get('url')}
+        if self.should_write(document) is False:
+            return result
+        if self.writer.is_writable(document) is False:
+            self.failed_urls.add(result['url'])
+            spider.logger.warning(f'Skipped a document without a coryn id: {document.get("name")}')
+            return result
+        self.batch.append((result['url'], document))
+        if len(self.batch) < self.batch_size:
+            return result
+        deferred = self.flush()
+        if len(self.pending_writes) > self.max_pending_writes:  # backpressure: wait for the writes to catch up
+            return deferred.addCallback(lambda _: result)
+        return result
+
+    def close_spider(self, spider):
+        if self.batch:
+            self.flush()
+        deferred = DeferredList(list(self.pending_writes), fireOnOneErrback=True, consumeErrors=True)
+
+        def on_closed(_):
+            spider.crawler.stats.set_value('mongo_pipeline/failed_urls', sorted(self.failed_urls))
+            spider.logger.info(
+                f'Wrote {self.written} documents to {self.collection_name} in {len(self.writer.timings)} batches '
+                f'({sum(timing.seconds for timing in self.writer.timings):.2f}s)'
+            )
+            if self.failures:
+                spider.logger.error(str(MongoPipelineError(self.collection_name, len(self.failures))))
+
+        deferred.addCallback(on_closed)
+        return deferred
+
+
+class MongoIncrementalPipeline(MongoBatchPipeline):
+    """:class:`MongoBatchPipeline` that only writes the documents whose content changed since the last scrape
+
+    The hash of every written document is kept in `scrapes.entities` once its batch was written, unchanged
+    documents are dropped before they reach a batch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entity_hashes: EntityHashStore | None = None
+        self.unchanged = 0
+
+    def open_spider(self, spider):
+        super().open_spider(spider)
+        self.entity_hashes = EntityHashStore(
+            WhiskeyDatabase(get_mongodb_client()).scrape_entities, self.collection_name
+        )
+        self.entity_hashes.load()
+
+    def should_write(self, document: dict) -> bool:
+        if self.entity_hashes.is_changed(document['_id'], document_hash(document)) is False:
+            self.unchanged += 1
+            return False
+        return True
+
+    def write(self, batch: list[tuple[str, dict]]) -> int:
+        written = super().write(batch)  # raises before any hash is saved if the batch was not written
+        self.entity_hashes.save({
+            document['_id']: document_hash(document) for _, document in batch if self.writer.is_writable(document)
+        })
+        return written
+
+    def close_spider(self, spider):
+        deferred = super().close_spider(spider)
+        deferred.addCallback(lambda _: spider.logger.info(f'Skipped {self.unchanged} unchanged documents'))
+        return deferred
@@ -7,7 +7,7 @@ from Utils.dataclasses.abc import WikiBaseModel
 from Utils.dataclasses.item import ItemLeaf
 from Utils.dataclasses.levelling import LevellingInformation
 from Utils.dataclasses.monster import MonsterLeaf
-from scraper.spiders.parsers.models import ParserResults
+from scraper.spiders.parsers.models import LeafResult
 
 
 def to_proxy(dataclass_factory: DataclassFactory) -> DataclassFactoryProxy:
@@ -17,7 +17,7 @@ def to_proxy(dataclass_factory: DataclassFactory) -> DataclassFactoryProxy:
 class IDataclassFactory(ABC):  # interface
 
     @abstractmethod
-    def convert(self, results: list[ParserResults]) -> WikiBaseModel:
+    def convert(self, results: list[LeafResult]) -> WikiBaseModel:
         pass
 
 
@@ -30,14 +30,14 @@ class DataclassFactoryProxy(IDataclassFactory):
         self.dataclass_factory = dataclass_factory
 
     @final
-    def convert(self, results: list[ParserResults]) -> WikiBaseModel:
+    def convert(self, results: list[LeafResult]) -> WikiBaseModel:
         self.dataclass_factory.convert(results)
 
 
 class DataclassFactory(IDataclassFactory, ABC):
 
     @staticmethod
-    def results_to_dict(results: list[ParserResults]) -> dict:
+    def results_to_dict(results: list[LeafResult]) -> dict:
         return {parser_result.parser['name']: parser_result.result for parser_result in results}
 
     @staticmethod
@@ -46,7 +46,7 @@ class DataclassFactory(IDataclassFactory, ABC):
         pass
 
     @final
-    def convert(self, results: list[ParserResults]) -> WikiBaseModel:
+    def convert(self, results: list[LeafResult]) -> WikiBaseModel:
         return self.build(self.results_to_dict(results))
 
 
@@ -0,0 +1,111 @@
+"""State kept between scrapes so that a re-scrape only parses and writes what changed on the site"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional, Iterable
+
+from pydantic import BaseModel as PydanticBaseModel, Field
+from pymongo import ReplaceOne, ASCENDING, UpdateOne
+
+from database.types import mongo_collection
+
+
+def content_hash(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def document_hash(document: dict) -> str:
+    """hash of the normalized document, independent of the key order"""
+    return content_hash(json.dumps(document, sort_keys=True, separators=(',', ':'), default=str))
+
+
+class PageState(PydanticBaseModel):
+    """What a listing page looked like the last time it was parsed"""
+    url: str = Field(..., alias='_id')
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    next_url: Optional[str] = None  # followed without a body when the server answers `304 Not Modified`
+    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        allow_population_by_field_name = True
+
+
+class PageStateStore:
+    """Page states of :param collection:, loaded before and saved after a crawl
+
+    The spider only reads and updates the in-memory states, so it never blocks the reactor on the database.
+    """
+
+    def __init__(self, collection: mongo_collection):
+        self.collection = collection
+        self._states: dict[str, PageState] = {}
+        self._updated: dict[str, PageState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def load(self) -> None:
+        self._states = {document['_id']: PageState(**document) for document in self.collection.find({})}
+        self._updated.clear()
+
+    def get(self, url: str) -> Optional[PageState]:
+        return self._states.get(url)
+
+    def update(self, state: PageState) -> None:
+        self._states[state.url] = state
+        self._updated[state.url] = state
+
+    def save(self, exclude: Iterable[str] = ()) -> int:
+        """Writes the updated page states except those of :param exclude:, the pages whose documents
+        were not all written, so that they are parsed again by the next scrape
+
+        Returns:
+            The number of page states that were written
+        """
+        exclude = set(exclude)
+        updated = {url: state for url, state in self._updated.items() if url not in exclude}
+        self._updated.clear()
+        if not updated:
+            return 0
+        self.collection.bulk_write([
+            ReplaceOne({'_id': url}, state.dict(by_alias=True), upsert=True) for url, state in updated.items()
+        ], ordered=False)
+        return len(updated)
+
+
+class EntityHashStore:
+    """Hash of the last written document of every entity of a collection"""
+
+    def __init__(self, collection: mongo_collection, target_collection_name: str):
+        self.collection = collection
+        self.target_collection_name = target_collection_name
+        self._hashes: dict = {}
+
+    def load(self) -> None:
+        self.collection.create_index([('collection', ASCENDING), ('entity_id', ASCENDING)], unique=True)
+        self._hashes = {
+            document['entity_id']: document['content_hash']
+            for document in self.collection.find(
+                {'collection': self.target_collection_name}, {'entity_id': 1, 'content_hash': 1}
+            )
+        }
+
+    def is_changed(self, entity_id, document_content_hash: str) -> bool:
+        return self._hashes.get(entity_id) != document_content_hash
+
+    def save(self, hashes: dict) -> None:
+        """Records :param hashes: (entity id to hash) once their documents have been written"""
+        if not hashes:
+            return
+        self.collection.bulk_write([
+            UpdateOne(
+                {'collection': self.target_collection_name, 'entity_id': entity_id},
+                {'$set': {'content_hash': document_content_hash, 'scraped_at': datetime.utcnow()}},
+                upsert=True
+            ) for entity_id, document_content_hash in hashes.items()
+        ], ordered=False)
+        self._hashes.update(hashes)
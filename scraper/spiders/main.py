@@ -1,20 +1,36 @@
 """in case if developer wants to scraper manually"""
 import pprint
+import sys
 from abc import ABC, abstractmethod
-from typing import final
+from collections import defaultdict
+from datetime import datetime
+from typing import final, Optional
+from urllib.parse import urlparse, parse_qs
 
 from pydantic import BaseModel
+from pymongo import ReplaceOne
+from scrapy.crawler import CrawlerProcess
+from scrapy.settings import Settings
 from scrapyscript import Job as ScrapyJob, Processor as ScrapyProcessor
 
+from Utils.dataclasses.levelling import LevellingInformation, LevellingTable
 from Utils.generics import split_by_chunk
-from database import get_mongodb_client
+from database import get_mongodb_client, mongo_collection
+from database.composites import CompositeBuilder, ItemCompositeBuilder, MonsterCompositeBuilder
 from database.command.write import InsertMany, DatabaseOperations
 from database.models import WhiskeyDatabase
-from scraper.spiders.converters import ItemInformationConverter, MonsterInformationConverter
+from scraper.pipelines import MongoPipelineError
+from scraper.spiders.converters import ItemInformationConverter, MonsterInformationConverter, \
+    LevellingInformationConverter
+from scraper.spiders.incremental import PageStateStore
 from scraper.spiders.parsers.coryn.item import ItemCompositeParser
+from scraper.spiders.parsers.coryn.levelling import LevellingCompositeParser
 from scraper.spiders.parsers.coryn.monster import MonsterCompositeParser
 from scraper.spiders.scrapers import ScraperInformation
-from scraper.spiders.scrapers.concrete_scrapers import CorynScraper
+from scraper.spiders.scrapers.concrete_scrapers import CorynScraper, IncrementalCorynScraper, ShardedCorynScraper, \
+    MultiPageCorynScraper, sharded_crawl_settings
+
+MAX_LEVEL = 300
 
 
 class Scrape(ABC):
@@ -24,7 +40,7 @@ class Scrape(ABC):
 
     @staticmethod
     @abstractmethod
-    def get_scraper_information() -> ScraperInformation:
+    def get_scraper_information() -> ScraperInformation | list[ScraperInformation]:
         pass
 
     @staticmethod
@@ -35,11 +51,19 @@ class Scrape(ABC):
             results: the results returned from the scraped objects
         """
 
+    def get_settings(self) -> Optional[Settings]:
+        return
+
+    def get_jobs(self) -> list[ScrapyJob]:
+        scraper_information = self.get_scraper_information()
+        if isinstance(scraper_information, ScraperInformation):
+            scraper_information = [scraper_information]
+        return [ScrapyJob(CorynScraper, information) for information in scraper_information]
+
     @final
     def start(self):
-        processor = ScrapyProcessor(settings=None)
-        job = ScrapyJob(CorynScraper, self.get_scraper_information())
-        self.process_results(processor.run(job))
+        processor = ScrapyProcessor(settings=self.get_settings())
+        self.process_results(processor.run(self.get_jobs()))
         print('Finished')
 
 
@@ -82,7 +106,97 @@ class ScrapeCorynRaw(Scrape):
             pprint.pprint(result['result'].dict(by_alias=True))
 
 
-class MonsterMassScrape(Scrape):
+class StreamScrape(ABC):
+    """Scrape whose results are written to the database by :class:`MongoBatchPipeline` while crawling
+
+    With :param incremental: the listing pages and documents that did not change since the previous
+    scrape are skipped, see :class:`IncrementalCorynScraper` and :class:`MongoIncrementalPipeline`.
+    With :param sharded: every page of the listing is requested concurrently by :class:`ShardedCorynScraper`.
+    With :param record: the responses are kept in a :class:`ResponseStore` to be replayed offline.
+    The composites of the written leaves are rebuilt once the crawl is over, see :class:`CompositeBuilder`.
+    """
+    batch_size: int = 250
+
+    def __init__(self, incremental: bool = False, sharded: bool = False, concurrency: int = 8, record: bool = False):
+        if incremental is True and sharded is True:
+            raise ValueError('an incremental scrape follows the stored next pages and cannot be sharded')
+        self.mongodb_client = get_mongodb_client()
+        self.incremental = incremental
+        self.sharded = sharded
+        self.concurrency = concurrency
+        self.record = record
+
+    @staticmethod
+    @abstractmethod
+    def get_scraper_information() -> ScraperInformation:
+        pass
+
+    @abstractmethod
+    def get_collection(self) -> mongo_collection:
+        """the collection the results are written to"""
+
+    def get_composite_builder(self) -> Optional[CompositeBuilder]:
+        """builder of the composites of :meth:`get_collection`, if it has any"""
+        return
+
+    def build_composites(self, since: datetime) -> None:
+        if (builder := self.get_composite_builder()) is None:
+            return
+        if self.incremental is True:
+            build = builder.build_since(WhiskeyDatabase(self.mongodb_client).scrape_entities, since)
+        else:
+            build = builder.build()
+        print(f'Built {build.merged} composites, removed {build.removed} in {build.seconds:.2f}s')
+
+    def get_settings(self) -> Settings:
+        pipeline = 'MongoIncrementalPipeline' if self.incremental is True else 'MongoBatchPipeline'
+        settings = {
+            'ITEM_PIPELINES': {f'scraper.pipelines.{pipeline}': 300},
+            'MONGO_PIPELINE_COLLECTION': self.get_collection().full_name,
+            'MONGO_PIPELINE_BATCH_SIZE': self.batch_size
+        }
+        if self.sharded is True:
+            settings |= sharded_crawl_settings(self.concurrency)
+        if self.record is True:  # below HttpCompressionMiddleware (590) so that bodies are stored decompressed
+            settings |= {
+                'DOWNLOADER_MIDDLEWARES': {'scraper.middlewares.ResponseStoreMiddleware': 550},
+                'RESPONSE_STORE_ENABLED': True
+            }
+        return Settings(settings)
+
+    @staticmethod
+    def save_page_states(page_states: PageStateStore, stats) -> None:
+        """Saves the states of the pages whose documents were all written by a crawl that finished"""
+        if (finish_reason := stats.get_value('finish_reason')) != 'finished':
+            print(f'Kept the previous page states, the crawl ended with `{finish_reason}`')
+            return
+        failed_urls = stats.get_value('mongo_pipeline/failed_urls', [])
+        saved = page_states.save(exclude=failed_urls)
+        print(f'Saved {saved} page states, {len(failed_urls)} pages with unwritten documents will be parsed again')
+
+    @final
+    def start(self):
+        started = datetime.utcnow()
+        process = CrawlerProcess(self.get_settings())
+        if self.incremental is True:
+            page_states = PageStateStore(WhiskeyDatabase(self.mongodb_client).scrape_pages)
+            page_states.load()
+            crawler = process.create_crawler(IncrementalCorynScraper)
+            process.crawl(crawler, self.get_scraper_information(), page_states=page_states)
+            process.start()
+            self.save_page_states(page_states, crawler.stats)
+        else:
+            crawler = process.create_crawler(ShardedCorynScraper if self.sharded is True else CorynScraper)
+            process.crawl(crawler, self.get_scraper_information())
+            process.start()
+        if failed_writes := crawler.stats.get_value('mongo_pipeline/failed_writes'):
+            # the composites would be built from partially written leaves
+            raise MongoPipelineError(self.get_collection().full_name, failed_writes)
+        self.build_composites(started)
+        print('Finished')
+
+
+class MonsterMassScrape(StreamScrape):
     @staticmethod
     def get_scraper_information() -> ScraperInformation:
         return ScraperInformation(
@@ -92,13 +206,15 @@ class MonsterMassScrape(Scrape):
             converter=MonsterInformationConverter()
         )
 
-    def process_results(self, results: list[dict[str, BaseModel]]):
+    def get_collection(self) -> mongo_collection:
+        return WhiskeyDatabase(self.mongodb_client).monsters_leaf
+
+    def get_composite_builder(self) -> MonsterCompositeBuilder:
         whiskey_database = WhiskeyDatabase(self.mongodb_client)
-        collection = whiskey_database.monsters_leaf
-        collection.insert_many(list(result['result'].dict(by_alias=True) for result in results))
+        return MonsterCompositeBuilder(whiskey_database.monsters_leaf, whiskey_database.monsters_composite)
 
 
-class ItemMassScrape(Scrape):
+class ItemMassScrape(StreamScrape):
     @staticmethod
     def get_scraper_information() -> ScraperInformation:
         return ScraperInformation(
@@ -108,11 +224,70 @@ class ItemMassScrape(Scrape):
             converter=ItemInformationConverter()
         )
 
-    def process_results(self, results: list[dict[str, BaseModel]]):
+    def get_collection(self) -> mongo_collection:
+        return WhiskeyDatabase(self.mongodb_client).items_leaf
+
+    def get_composite_builder(self) -> ItemCompositeBuilder:
         whiskey_database = WhiskeyDatabase(self.mongodb_client)
-        collection = whiskey_database.items_leaf
-        collection.insert_many(list(result['result'].dict(by_alias=True) for result in results))
+        return ItemCompositeBuilder(whiskey_database.items_leaf, whiskey_database.items_composite)
+
+
+class LevellingMassScrape(Scrape):
+    """Scrapes the levelling tables of every level so that `/level` can be served from the database
+
+    Every level is requested by a single :class:`MultiPageCorynScraper` throttled to :param concurrency:
+    concurrent requests.
+    """
+
+    def __init__(self, max_level: int = MAX_LEVEL, concurrency: int = 8):
+        super().__init__()
+        self.max_level = max_level
+        self.concurrency = concurrency
+
+    @staticmethod
+    def get_level_url(level: int) -> str:
+        return f'https://coryn.club/leveling.php?lv={level}'
+
+    def get_scraper_information(self) -> ScraperInformation:
+        return ScraperInformation(
+            url=self.get_level_url(1),
+            parser=LevellingCompositeParser,
+            next_page=False,
+            converter=LevellingInformationConverter()
+        )
+
+    def get_settings(self) -> Settings:
+        return Settings(sharded_crawl_settings(self.concurrency))
+
+    def get_jobs(self) -> list[ScrapyJob]:
+        urls = [self.get_level_url(level) for level in range(1, self.max_level + 1)]
+        return [ScrapyJob(MultiPageCorynScraper, self.get_scraper_information(), urls=urls)]
+
+    @staticmethod
+    def get_level_from(url: str) -> int:
+        return int(parse_qs(urlparse(url).query)['lv'][0])
+
+    def process_results(self, results: list[dict[str, BaseModel]]):
+        by_level: dict[int, list[LevellingInformation]] = defaultdict(list)
+        for result in results:
+            by_level[self.get_level_from(result['url'])].append(result['result'])
+
+        if not by_level:
+            return
+        collection = WhiskeyDatabase(self.mongodb_client).levelling_tables
+        collection.bulk_write([
+            ReplaceOne(
+                {'_id': level},
+                LevellingTable(_id=level, information=information).dict(by_alias=True),
+                upsert=True
+            ) for level, information in by_level.items()
+        ], ordered=False)
 
 
 if __name__ == '__main__':
-    MonsterMassScrape().start()
+    if '--levelling' in sys.argv:
+        LevellingMassScrape().start()
+    else:
+        MonsterMassScrape(
+            incremental='--incremental' in sys.argv, sharded='--sharded' in sys.argv, record='--record' in sys.argv
+        ).start()
@@ -4,6 +4,7 @@ using the composite design pattern
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Generator, Optional, Type, Any, Final, final, Union
 
 from scrapy.http import Response
@@ -14,23 +15,29 @@ from Utils.types import SelectorType
 from scraper.spiders.converters import IDataclassFactory
 from scraper.spiders.exceptions import BadArgument, InitializationError
 from scraper.spiders.parsers.container_paths import ContainerPaths
-from scraper.spiders.parsers.models import ParserType, ParserInformation, ParserResults
+from scraper.spiders.parsers.generics import compiled_selector_from
+from scraper.spiders.parsers.models import ParserType, ParserInformation, LeafResult
 
 
-def parser_information_builder(parser: ParserLeaf) -> ParserInformation:
+@lru_cache(maxsize=None)
+def parser_information_builder(parser: Type[ParserLeaf]) -> ParserInformation:
+    """shared by every result of :param parser:, must not be mutated"""
     return {'name': parser.name, 'type': parser.type}
 
 
-def parser_results_builder(cls: ParserLeaf, result: Any, type_var):
-    return ParserResults[type_var](parser=parser_information_builder(cls), result=result)
+def parser_results_builder(cls: Type[ParserLeaf], result: Any, type_var) -> LeafResult:
+    return LeafResult(parser_information_builder(cls), result)
 
 
 def return_parser_results(type_var):
-    """A decorator for the :`ParserResults`: builder
+    """A decorator for the :`LeafResult`: builder
+
+    Args:
+        type_var: the type of the result, validated once by the model the results are converted into
     """
 
     def function(func):
-        def arguments(cls, container: SelectorType, response: Response) -> list[ParserResults]:
+        def arguments(cls, container: SelectorType, response: Response) -> list[LeafResult]:
             result = func(cls, container, response)
             return [parser_results_builder(cls, result=result, type_var=type_var)]
 
@@ -54,19 +61,19 @@ class BaseParser(ABC):
         self.converter = converter
 
     @final
-    def parse(self, response) -> Generator[Union[list[ParserResults], WikiBaseModel], None, None]:
+    def parse(self, response) -> Generator[Union[list[LeafResult], WikiBaseModel], None, None]:
         """The method that returns the results to the client"""
-        containers = response.xpath(self.container_path.get())
+        containers = compiled_selector_from(response).xpath(self.container_path.get())
         for container in containers:
             if container:
                 if self.converter is None:
-                    yield self.get_result(container, response)  # type: list[ParserResults]
+                    yield self.get_result(container, response)  # type: list[LeafResult]
                 else:
                     yield self.converter.convert(self.get_result(container, response))  # type: WikiBaseModel
 
     @classmethod
     @abstractmethod  # protected method (if this was not python)
-    def get_result(cls, container: SelectorType, response: Response) -> list[ParserResults]:
+    def get_result(cls, container: SelectorType, response: Response) -> list[LeafResult]:
         """The method that is used by the parse method to get results from the container object
         """
 
@@ -77,8 +84,8 @@ class CompositeParser(BaseParser, ABC):
     parser_leaf_class: Type[ParserLeaf]
 
     @classmethod
-    def get_result(cls, container: SelectorType, response: Response) -> list[ParserResults]:
-        def generate() -> Generator[ParserResults, None, None]:
+    def get_result(cls, container: SelectorType, response: Response) -> list[LeafResult]:
+        def generate() -> Generator[LeafResult, None, None]:
             for parser in cls.parsers:
                 yield parser.get_result(container, response)
 
@@ -7,7 +7,7 @@ from Utils.types import SelectorType
 from scraper.spiders.parsers.abc import ParserLeaf, return_parser_results, CompositeParser
 from scraper.spiders.parsers.container_paths import SkillPath
 from scraper.spiders.parsers.generics import get_container_from
-from scraper.spiders.parsers.models import ParserResults
+from scraper.spiders.parsers.models import LeafResult
 
 
 class SkillParserLeaf(ParserLeaf, ABC):
@@ -31,7 +31,7 @@ class SkillDetailsParser(SkillParserLeaf):
 
     @classmethod
     @return_parser_results(str)
-    def get_result(cls, container: SelectorType, response: Response) -> list[ParserResults]:
+    def get_result(cls, container: SelectorType, response: Response) -> list[LeafResult]:
         for form in container.xpath('.//details/span[@class="sub-title"]/following-sibling::*'):
             form_id = form.xpath('@id').get()
             form_page = fromstring(response.body)
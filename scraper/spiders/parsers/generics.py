@@ -1,10 +1,83 @@
 from typing import Optional
 
+from lxml import etree
 from scrapy import Selector
+from scrapy.http import Response
 
 from Utils.types import CORYN_NULL_TYPES, SelectorType
 
 
+class CompiledXPathRegistry:
+    """Compiles every XPath expression once with :class:`lxml.etree.XPath`
+
+    `Selector.xpath` recompiles its expression on every call, the parsers evaluate the same few hundred
+    expressions against every container of a page.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._compiled: dict[tuple[str, frozenset], Optional[etree.XPath]] = {}
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+    def get(self, query: str, namespaces: dict[str, str]) -> Optional[etree.XPath]:
+        """
+        Returns:
+            :param query: compiled with the prefixes of :param namespaces: or None if lxml cannot compile it,
+            the caller falls back to `Selector.xpath`
+        """
+        key = (query, frozenset(namespaces.items()))
+        try:
+            return self._compiled[key]
+        except KeyError:
+            try:
+                compiled = etree.XPath(query, namespaces=namespaces, smart_strings=False)
+            except etree.XPathSyntaxError:
+                compiled = None
+            self._compiled[key] = compiled
+            return compiled
+
+    def clear(self) -> None:
+        self._compiled.clear()
+
+
+xpath_registry = CompiledXPathRegistry()
+
+
+class CompiledXPathSelector(Selector):
+    """Selector evaluating its XPath expressions through :data:`xpath_registry`
+
+    Selectors returned by :meth:`xpath` are of the same class, so every container and sub-container
+    selected from a :func:`compiled_selector_from` benefits from the registry.
+    """
+    __slots__ = ()
+
+    def xpath(self, query, namespaces=None, **kwargs):
+        if (
+                xpath_registry.enabled is False or namespaces is not None or kwargs
+                or getattr(self.root, 'xpath', None) is None  # text nodes
+                or (compiled := xpath_registry.get(query, self.namespaces)) is None
+        ):
+            return super().xpath(query, namespaces, **kwargs)
+        try:
+            result = compiled(self.root)
+        except etree.XPathError:  # let Selector.xpath raise its usual error
+            return super().xpath(query, namespaces, **kwargs)
+
+        if type(result) is not list:
+            result = [result]
+        return self.selectorlist_cls(
+            [self.__class__(root=x, _expr=query, namespaces=self.namespaces, type=self.type) for x in result]
+        )
+
+
+def compiled_selector_from(response: Response) -> CompiledXPathSelector:
+    """:class:`CompiledXPathSelector` over the already parsed document of :param response:"""
+    selector = response.selector
+    return CompiledXPathSelector(root=selector.root, type=selector.type, namespaces=selector.namespaces)
+
+
 def selector_from(container, xpath: str) -> SelectorType:
     """A wrapper shortcut for response and xpath
     """
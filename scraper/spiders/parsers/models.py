@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum, auto
-from typing import TypeVar, TypedDict, Generic, Optional
+from typing import TypeVar, TypedDict, Generic, Optional, NamedTuple, Any
 
 import scrapy
 from pydantic import BaseModel as PydanticBaseModel
@@ -21,7 +21,14 @@ class ParserInformation(TypedDict):
     type: ParserType
 
 
+class LeafResult(NamedTuple):
+    """Result of a leaf parser on the parse path, validated once by the model the results are converted into"""
+    parser: ParserInformation
+    result: Any
+
+
 class ParserResults(PydanticGenericModel, Generic[ResultType]):
+    """Validated form of a :class:`LeafResult`"""
     parser: ParserInformation
     result: Optional[ResultType]
 
@@ -0,0 +1,113 @@
+"""On-disk store of crawled responses, so that the parsers can be rerun without the network"""
+import gzip
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Generator, Type
+
+from scrapy.http import HtmlResponse
+
+from Utils.dataclasses.abc import WikiBaseModel
+from scraper.spiders.converters import IDataclassFactory
+from scraper.spiders.parsers.abc import BaseParser
+from scraper.spiders.parsers.models import LeafResult
+
+DEFAULT_PATH = Path(__file__).parents[2] / 'data' / 'responses'
+
+
+def today() -> str:
+    return datetime.utcnow().date().isoformat()
+
+
+class ResponseStore:
+    """Content-addressed store of response bodies with one index per crawl date
+
+    Bodies are gzip-compressed under `blobs/` and named by the sha256 of their content, so a page that did not
+    change between two crawls is stored once. `index/<date>.json` maps every url crawled that day to its blob.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = path
+        self._indexes: dict[str, dict[str, dict]] = {}
+
+    def blob_path(self, digest: str) -> Path:
+        return self.path / 'blobs' / digest[:2] / f'{digest}.html.gz'
+
+    def index_path(self, date: str) -> Path:
+        return self.path / 'index' / f'{date}.json'
+
+    def dates(self) -> list[str]:
+        return sorted(path.stem for path in (self.path / 'index').glob('*.json'))
+
+    def index(self, date: str) -> dict[str, dict]:
+        if date not in self._indexes:
+            try:
+                self._indexes[date] = json.loads(self.index_path(date).read_text())
+            except FileNotFoundError:
+                self._indexes[date] = {}
+        return self._indexes[date]
+
+    def save(self, response, date: Optional[str] = None) -> str:
+        """Stores the body of :param response: and indexes it under :param date:, today by default
+
+        Returns:
+            The digest of the body
+        """
+        digest = hashlib.sha256(response.body).hexdigest()
+        if (blob_path := self.blob_path(digest)).exists() is False:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            blob_path.write_bytes(gzip.compress(response.body))
+        self.index(date or today())[response.url] = {
+            'digest': digest, 'status': response.status, 'encoding': getattr(response, 'encoding', 'utf-8')
+        }
+        return digest
+
+    def flush(self) -> None:
+        """Persists the indexes changed by :meth:`save`"""
+        for date, index in self._indexes.items():
+            self.index_path(date).parent.mkdir(parents=True, exist_ok=True)
+            self.index_path(date).write_text(json.dumps(index, indent=2, sort_keys=True))
+
+    def load(self, url: str, date: str) -> Optional[HtmlResponse]:
+        if (entry := self.index(date).get(url)) is None:
+            return
+        return HtmlResponse(
+            url=url,
+            status=entry['status'],
+            body=gzip.decompress(self.blob_path(entry['digest']).read_bytes()),
+            encoding=entry['encoding']
+        )
+
+    def responses(self, date: str, path: Optional[str] = None) -> Generator[HtmlResponse, None, None]:
+        """Every response of :param date:, only those whose url contains :param path: if given"""
+        for url in sorted(self.index(date)):
+            if path is None or path in url:
+                yield self.load(url, date)
+
+
+def replay(
+        store: ResponseStore,
+        parser: Type[BaseParser],
+        converter: Optional[IDataclassFactory] = None,
+        *,
+        date: Optional[str] = None,
+        path: Optional[str] = None
+) -> Generator[list[LeafResult] | WikiBaseModel, None, None]:
+    """Feeds the stored responses of :param date: (the latest crawl by default) through :meth:`BaseParser.parse`"""
+    if date is None:
+        if not (dates := store.dates()):
+            return
+        date = dates[-1]
+    for response in store.responses(date, path):
+        yield from parser(parser.container_path, converter).parse(response)
+
+
+if __name__ == '__main__':
+    from scraper.spiders.converters import ItemInformationConverter
+    from scraper.spiders.parsers.coryn.item import ItemCompositeParser
+
+    started = time.perf_counter()
+    amount = sum(1 for _ in replay(ResponseStore(), ItemCompositeParser, ItemInformationConverter(), path='item.php'))
+    print(f'Reparsed {amount} items in {time.perf_counter() - started:.2f}s')
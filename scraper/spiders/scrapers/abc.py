@@ -4,7 +4,7 @@ from typing import Optional, Generator
 import scrapy
 
 from Utils.dataclasses.abc import WikiBaseModel
-from scraper.spiders.parsers.models import ParserResults
+from scraper.spiders.parsers.models import LeafResult
 from scraper.spiders.scrapers import models
 
 
@@ -30,8 +30,8 @@ class Scraper(scrapy.Spider, ABC):
 
     def parse(self, response) -> Generator[dict | scrapy.Request, None, None]:
         for result in self.parser(self.container_path, self.converter).parse(response):
-            # type: list[ParserResults] | WikiBaseModel
-            yield {'result': result}
+            # type: list[LeafResult] | WikiBaseModel
+            yield {'result': result, 'url': response.url}
 
         if self.next_page is True:
             yield self.get_next_page(response)
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Optional, Generator
+from urllib.parse import urlparse, parse_qsl, urlencode
 
 import scrapy
 
 from scraper.spiders.exceptions import InvalidUrl
-from scraper.spiders.scrapers import Scraper
+from scraper.spiders.incremental import PageStateStore, PageState, content_hash
+from scraper.spiders.scrapers import Scraper, ScraperInformation
 
 
 class CorynScraper(Scraper):
@@ -21,3 +23,135 @@ class CorynScraper(Scraper):
             if button.xpath('./i[@class="fas fa-angle-right"]').get() is not None:
                 if (button := button.xpath('@href').get()) is not None:
                     return response.follow(button, callback=self.parse)
+
+
+def sharded_crawl_settings(concurrency: int = 8) -> dict:
+    """settings of a crawl by :class:`ShardedCorynScraper`, AutoThrottle keeps the site from being flooded"""
+    return {
+        'CONCURRENT_REQUESTS_PER_DOMAIN': concurrency,
+        'AUTOTHROTTLE_ENABLED': True,
+        'AUTOTHROTTLE_START_DELAY': 0.5,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': float(concurrency)
+    }
+
+
+class MultiPageCorynScraper(CorynScraper):
+    """:class:`CorynScraper` that crawls every url of :param urls: with the parser of :param scraper_information:
+
+    A single crawler requests all of them, so that its per-domain concurrency and AutoThrottle settings apply to
+    the whole crawl, see :func:`sharded_crawl_settings`.
+    """
+    name = 'coryn_multi_page'
+
+    def __init__(self, scraper_information: ScraperInformation, urls: list[str]):
+        super().__init__(scraper_information)
+        self.start_urls = [verified for url in urls for verified in self.verify_url(url)]
+
+
+class ShardedCorynScraper(CorynScraper):
+    """:class:`CorynScraper` that requests every page of a listing up front instead of following the next arrow
+
+    The page numbers are read from the pagination links of each response, so pages are scheduled as soon as
+    they are known and downloaded concurrently, see :func:`sharded_crawl_settings`.
+    """
+    name = 'coryn_sharded'
+    page_parameter = 'p'
+
+    def __init__(self, scraper_information: ScraperInformation):
+        super().__init__(scraper_information)
+        self.scheduled_up_to = self.get_page_number(self.start_urls[0])
+
+    @classmethod
+    def get_page_number(cls, url: str) -> int:
+        return int(dict(parse_qsl(urlparse(url).query)).get(cls.page_parameter, 0))
+
+    @classmethod
+    def get_page_url(cls, url: str, page: int) -> str:
+        parsed_url = urlparse(url)
+        query = dict(parse_qsl(parsed_url.query))
+        query[cls.page_parameter] = str(page)
+        return parsed_url._replace(query=urlencode(query)).geturl()
+
+    def get_last_page(self, response) -> int:
+        pages = response.css('div.pagination-group-btn a::attr(href)').re(rf'[?&]{self.page_parameter}=(\d+)')
+        return max(map(int, pages), default=self.get_page_number(response.url))
+
+    def schedule_pages(self, response) -> Generator[scrapy.Request, None, None]:
+        last_page = self.get_last_page(response)
+        for page in range(self.scheduled_up_to + 1, last_page + 1):
+            yield scrapy.Request(self.get_page_url(self.start_urls[0], page), callback=self.parse)
+        self.scheduled_up_to = max(self.scheduled_up_to, last_page)
+
+    def parse(self, response) -> Generator[dict | scrapy.Request, None, None]:
+        if self.next_page is True:  # scheduled before parsing so that the downloads overlap with it
+            yield from self.schedule_pages(response)
+        for result in self.parser(self.container_path, self.converter).parse(response):
+            yield {'result': result, 'url': response.url}
+
+
+class IncrementalCorynScraper(CorynScraper):
+    """:class:`CorynScraper` that skips the listing pages which did not change since the last scrape
+
+    Pages are requested conditionally with the stored `ETag` / `Last-Modified`, a `304 Not Modified` or a
+    page whose containers hash to the stored content hash is not parsed, its stored next page is followed instead.
+    """
+    name = 'coryn_incremental'
+    handle_httpstatus_list = [304]
+
+    def __init__(self, scraper_information: ScraperInformation, page_states: PageStateStore):
+        super().__init__(scraper_information)
+        self.page_states = page_states
+        self.skipped_pages = 0
+        self.parsed_pages = 0
+
+    def request(self, url: str) -> scrapy.Request:
+        headers = {}
+        if (state := self.page_states.get(url)) is not None:
+            if state.etag is not None:
+                headers['If-None-Match'] = state.etag
+            if state.last_modified is not None:
+                headers['If-Modified-Since'] = state.last_modified
+        return scrapy.Request(url, callback=self.parse, headers=headers)
+
+    def start_requests(self) -> Generator[scrapy.Request, None, None]:
+        for url in self.start_urls:
+            yield self.request(url)
+
+    def get_next_page(self, response) -> Optional[scrapy.Request]:
+        if (request := super().get_next_page(response)) is not None:
+            return self.request(request.url)
+
+    def parse(self, response) -> Generator[dict | scrapy.Request, None, None]:
+        state = self.page_states.get(response.url)
+        if response.status == 304:
+            self.skipped_pages += 1
+            if self.next_page is True and state is not None and state.next_url is not None:
+                yield self.request(state.next_url)
+            return
+
+        page_hash = content_hash(''.join(response.xpath(self.container_path.get()).getall()))
+        next_request = self.get_next_page(response) if self.next_page is True else None
+        if state is not None and state.content_hash == page_hash:
+            self.skipped_pages += 1
+        else:
+            self.parsed_pages += 1
+            for result in self.parser(self.container_path, self.converter).parse(response):
+                yield {'result': result, 'url': response.url}
+
+        self.page_states.update(PageState(
+            url=response.url,
+            content_hash=page_hash,
+            etag=self.get_header(response, 'ETag'),
+            last_modified=self.get_header(response, 'Last-Modified'),
+            next_url=next_request.url if next_request is not None else None
+        ))
+        if next_request is not None:
+            yield next_request
+
+    @staticmethod
+    def get_header(response, name: str) -> Optional[str]:
+        if (value := response.headers.get(name)) is not None:
+            return value.decode('latin-1')
+
+    def closed(self, reason):
+        self.logger.info(f'Parsed {self.parsed_pages} pages, skipped {self.skipped_pages} unchanged pages')
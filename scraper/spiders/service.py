@@ -0,0 +1,94 @@
+"""A long-lived crawler that serves scrape jobs from asyncio code"""
+import asyncio
+import threading
+from typing import Optional
+
+from scrapy import signals
+from scrapy.crawler import CrawlerRunner
+from scrapy.settings import Settings
+
+from Utils.dataclasses.abc import WikiBaseModel
+from scraper.spiders.scrapers import ScraperInformation
+from scraper.spiders.scrapers.concrete_scrapers import CorynScraper
+from scraper.spiders.workers import ScrapeWorkerPool, WorkerPoolInfo
+
+
+class CrawlerService:
+    """Runs a single Twisted reactor in a background thread for the lifetime of the process
+
+    Jobs run on a :class:`ScrapeWorkerPool` of :param max_concurrent_jobs: workers, each job is crawled by
+    :class:`CorynScraper` inside the shared reactor, so a job only costs network and parse time instead of a
+    reactor start-up, settings load and child process.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, max_concurrent_jobs: int = 2):
+        self.settings = settings or Settings()
+        self.pool = ScrapeWorkerPool(max_concurrent_jobs)
+        self._runner: Optional[CrawlerRunner] = None
+        self._reactor = None
+        self._thread: Optional[threading.Thread] = None
+        self._crawls: set[asyncio.Future] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def info(self) -> WorkerPoolInfo:
+        return self.pool.info()
+
+    def start(self) -> None:
+        """Starts the reactor thread"""
+        if self.is_running:
+            return
+        from twisted.internet import reactor  # installs the default reactor of this process
+        self._reactor = reactor
+        self._runner = CrawlerRunner(self.settings)
+        self._thread = threading.Thread(
+            target=reactor.run, kwargs={'installSignalHandlers': False}, name='crawler-service', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        for crawl in list(self._crawls):  # their reactor is stopped, they would never complete
+            crawl.cancel()
+        if self.is_running:
+            self._reactor.callFromThread(self._reactor.stop)
+
+    async def scrape(self, scraper_information: ScraperInformation) -> list[WikiBaseModel]:
+        """Crawls a job once a worker of the pool is free"""
+        items = await self.pool.run(lambda: self._crawl(scraper_information))
+        return [item['result'] for item in items]
+
+    def _crawl(self, scraper_information: ScraperInformation) -> asyncio.Future:
+        """
+        Returns:
+            A future of the items yielded by the scraper, each a :class:`dict` with the `result` and `url`
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._crawls.add(future)
+        future.add_done_callback(self._crawls.discard)
+
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exc):
+            if not future.done():
+                future.set_exception(exc)
+
+        def crawl():  # runs in the reactor thread
+            items = []
+            crawler = self._runner.create_crawler(CorynScraper)
+            crawler.signals.connect(lambda item, **_: items.append(item), signal=signals.item_scraped, weak=False)
+            deferred = self._runner.crawl(crawler, scraper_information)
+            deferred.addCallbacks(
+                lambda _: loop.call_soon_threadsafe(set_result, items),
+                lambda failure: loop.call_soon_threadsafe(set_exception, failure.value)
+            )
+
+        self._reactor.callFromThread(crawl)
+        return future
+
+
+crawler_service = CrawlerService()
@@ -0,0 +1,44 @@
+"""Bounds the scrape jobs awaited from the asyncio event loop"""
+import asyncio
+from typing import Awaitable, Callable, TypeVar, NamedTuple
+
+T = TypeVar('T')
+
+
+class WorkerPoolInfo(NamedTuple):
+    running: int
+    queue_depth: int  # jobs waiting for a free worker
+    completed: int
+
+
+class ScrapeWorkerPool:
+    """Bounded pool of workers for scrape jobs
+
+    A job crawls outside of the event loop, e.g. in the reactor of :class:`scraper.spiders.service.CrawlerService`,
+    and is only awaited here, so the event loop keeps serving other commands. At most :param max_workers: jobs run
+    at once, the rest wait in the queue.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.running = 0
+        self.queue_depth = 0
+        self.completed = 0
+
+    def info(self) -> WorkerPoolInfo:
+        return WorkerPoolInfo(self.running, self.queue_depth, self.completed)
+
+    async def run(self, job: Callable[[], Awaitable[T]]) -> T:
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        self.running += 1
+        try:
+            return await job()
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()